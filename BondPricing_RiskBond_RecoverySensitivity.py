@@ -2,23 +2,23 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from curves import TermStructure
+from oas_engine import oas_model_batch
+from pricing_kernels import flat_bond_price, survival_price
+from survival_batch import survival_based_pricing_batch
+from survival_greeks import survival_greeks
+
 
 # --- Model Definitions (Same as before) ---
 
 def survival_based_pricing(face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate, frequency=2):
-    dt = 1 / frequency
-    periods = int(years * frequency)
-    coupon = face_value * coupon_rate / frequency
-    npv = 0
-    for i in range(1, periods + 1):
-        t = i * dt
-        survival_prob = np.exp(-hazard_rate * t)
-        default_prob = np.exp(-hazard_rate * (t - dt)) - survival_prob
-        discount_factor = np.exp(-risk_free_rate * t)
-        npv += coupon * survival_prob * discount_factor
-        npv += recovery_rate * face_value * default_prob * discount_factor
-    npv += face_value * survival_prob * np.exp(-risk_free_rate * years)
-    return npv
+    if isinstance(risk_free_rate, TermStructure) or isinstance(hazard_rate, TermStructure):
+        dt = 1 / frequency
+        periods = int(years * frequency)
+        times = np.arange(1, periods + 1) * dt
+        return survival_price(face_value, face_value * coupon_rate / frequency, recovery_rate, risk_free_rate,
+                              hazard_rate, times, times - dt, periods * dt, years)
+    return flat_bond_price(face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate, frequency)
 
 
 def oas_model(face_value, coupon_rate, years, oas_spread, call_price, call_year,
@@ -53,14 +53,15 @@ def oas_model(face_value, coupon_rate, years, oas_spread, call_price, call_year,
 def rating_based_pricing(face_value, coupon_rate, years, rating_defaults, recovery_rate, risk_free_rate, frequency=1):
     npv = 0
     coupon = face_value * coupon_rate / frequency
+    cumulative_defaults = np.cumsum(rating_defaults[:int(years)])
     for i, pd in enumerate(rating_defaults[:int(years)]):
         t = i + 1
-        survival_prob = 1 - sum(rating_defaults[:t])
+        survival_prob = 1 - cumulative_defaults[i]
         default_prob = pd
         df = np.exp(-risk_free_rate * t)
         npv += coupon * survival_prob * df
         npv += recovery_rate * face_value * default_prob * df
-    final_survival = 1 - sum(rating_defaults[:int(years)])
+    final_survival = 1 - cumulative_defaults[-1]
     npv += face_value * final_survival * np.exp(-risk_free_rate * years)
     return npv
 
@@ -116,8 +117,8 @@ def main():
     rating_defaults = [0.02, 0.025, 0.03, 0.035, 0.04]
     df_recovery = pd.DataFrame({
         'Recovery Rate': recovery_rates,
-        'NPV (Survival-Based)': [survival_based_pricing(face_value, coupon_rate, years, risk_free_rate, 0.15, r) for r
-                                 in recovery_rates],
+        'NPV (Survival-Based)': survival_based_pricing_batch(face_value, coupon_rate, years, risk_free_rate, 0.15,
+                                                             recovery_rates),
         'NPV (Rating-Based)': [rating_based_pricing(face_value, coupon_rate, years, rating_defaults, r, risk_free_rate)
                                for r in recovery_rates]
     })
@@ -125,15 +126,18 @@ def main():
     hazard_rates = np.linspace(0.01, 0.30, 30)
     df_hazard = pd.DataFrame({
         'Hazard Rate': hazard_rates,
-        'NPV (Survival-Based)': [survival_based_pricing(face_value, coupon_rate, years, risk_free_rate, h, 0.4) for h in
-                                 hazard_rates]
+        'NPV (Survival-Based)': survival_based_pricing_batch(face_value, coupon_rate, years, risk_free_rate,
+                                                             hazard_rates, 0.4)
     })
 
     oas_values = np.linspace(0.0, 0.1, 20)
+    oas_npv, oas_stderr = oas_model_batch(face_value, coupon_rate, years, oas_values, call_price, call_year,
+                                          n_paths=1024, rng=42, sampler='sobol', control_variate=True,
+                                          return_stderr=True)
     df_oas = pd.DataFrame({
         'OAS Spread (bps)': oas_values * 10000,
-        'NPV (Callable Bond)': [oas_model(face_value, coupon_rate, years, oas, call_price, call_year) for oas in
-                                oas_values]
+        'NPV (Callable Bond)': oas_npv,
+        'Std Error': oas_stderr
     })
 
     # Print DataFrames locally
@@ -146,6 +150,9 @@ def main():
     print("\n📊 OAS Spread Sensitivity\n")
     print(df_oas.to_string(index=False))
 
+    print("\n📊 Analytic Greeks (Hazard 15%, Recovery 40%)\n")
+    print(survival_greeks(face_value, coupon_rate, years, risk_free_rate, 0.15, 0.4).to_string(index=False))
+
     # Plot all sensitivity charts
     plot_recovery_sensitivity(df_recovery)
     plot_hazard_vs_npv(df_hazard)
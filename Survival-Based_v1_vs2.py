@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from pricing_kernels import survival_cashflow_table, survival_price
+
 # --- Parameters ---
 face_value = 100
 coupon_rate = 0.05
@@ -16,97 +18,26 @@ dt = 1 / frequency
 time_steps = np.arange(dt, years + dt, dt)
 
 # --- Formula 1: Flow-Oriented with Debug Option ---
+# Default window for each coupon date is (t - dt, t].
 def npv_formula_1(face_value, coupon_rate, risk_free_rate, hazard_rate, recovery_rate, time_steps, debug=False):
-    npv = 0
     coupon = face_value * coupon_rate / frequency
-    data = []
-
-    for t in time_steps:
-        surv = np.exp(-hazard_rate * t)
-        surv_prev = np.exp(-hazard_rate * (t - dt))
-        default_prob = surv_prev - surv
-        discount = np.exp(-risk_free_rate * t)
-        coupon_leg = coupon * surv * discount
-        recovery_leg = recovery_rate * face_value * default_prob * discount
-        npv += coupon_leg + recovery_leg
-
-        if debug:
-            data.append({
-                'Time (t)': round(t, 3),
-                'Survival Prob': round(surv, 6),
-                'Default Prob': round(default_prob, 6),
-                'Discount Factor': round(discount, 6),
-                'Coupon Leg': round(coupon_leg, 6),
-                'Recovery Leg': round(recovery_leg, 6),
-                'Cumulative NPV': round(npv, 6)
-            })
-
-    # Final Principal Repayment
-    final_surv = np.exp(-hazard_rate * time_steps[-1])
-    final_discount = np.exp(-risk_free_rate * time_steps[-1])
-    final_leg = face_value * final_surv * final_discount
-    npv += final_leg
-
+    args = (face_value, coupon, recovery_rate, risk_free_rate, hazard_rate, time_steps, time_steps - dt,
+            time_steps[-1])
+    npv = survival_price(*args)
     if debug:
-        data.append({
-            'Time (t)': round(time_steps[-1], 3),
-            'Survival Prob': round(final_surv, 6),
-            'Default Prob': 0.0,
-            'Discount Factor': round(final_discount, 6),
-            'Coupon Leg': 0.0,
-            'Recovery Leg': 0.0,
-            'Cumulative NPV': round(npv, 6)
-        })
-        return npv, pd.DataFrame(data)
-
+        return npv, survival_cashflow_table(*args)
     return npv
 
 # --- Formula 2: Academic Notation with Debug Option ---
+# Q(t) survival, Z(t) discount, D_t = Q(t_prev) - Q(t) with Q(t_0) = 1 for the first period.
 def npv_formula_2(face_value, coupon_rate, risk_free_rate, hazard_rate, recovery_rate, time_steps, debug=False):
-    Q = lambda t: np.exp(-hazard_rate * t)
-    Z = lambda t: np.exp(-risk_free_rate * t)
     C = face_value * coupon_rate
     f = frequency
-    npv = 0
-    data = []
-
-    for i, t in enumerate(time_steps):
-        Q_t = Q(t)
-        Q_prev = Q(t - dt) if i > 0 else 1.0
-        D_t = Q_prev - Q_t
-        Z_t = Z(t)
-        coupon_leg = Q_t * Z_t * (C / f)
-        recovery_leg = D_t * Z_t * recovery_rate * face_value
-        npv += coupon_leg + recovery_leg
-
-        if debug:
-            data.append({
-                'Time (t)': round(t, 3),
-                'Survival Prob': round(Q_t, 6),
-                'Default Prob': round(D_t, 6),
-                'Discount Factor': round(Z_t, 6),
-                'Coupon Leg': round(coupon_leg, 6),
-                'Recovery Leg': round(recovery_leg, 6),
-                'Cumulative NPV': round(npv, 6)
-            })
-
-    final_Q = Q(time_steps[-1])
-    final_Z = Z(time_steps[-1])
-    final_leg = final_Q * final_Z * face_value
-    npv += final_leg
-
+    t_prev = np.concatenate([[0.0], time_steps[1:] - dt])
+    args = (face_value, C / f, recovery_rate, risk_free_rate, hazard_rate, time_steps, t_prev, time_steps[-1])
+    npv = survival_price(*args)
     if debug:
-        data.append({
-            'Time (t)': round(time_steps[-1], 3),
-            'Survival Prob': round(final_Q, 6),
-            'Default Prob': 0.0,
-            'Discount Factor': round(final_Z, 6),
-            'Coupon Leg': 0.0,
-            'Recovery Leg': 0.0,
-            'Cumulative NPV': round(npv, 6)
-        })
-        return npv, pd.DataFrame(data)
-
+        return npv, survival_cashflow_table(*args)
     return npv
 
 # --- Plotting Function ---
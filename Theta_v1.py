@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+import curves
+import pricing_kernels
+
 # Example setup: survival-based pricing of a distressed bond
 
 # Bond parameters
@@ -21,11 +24,11 @@ payment_times = np.arange(1 / frequency, maturity_years + 1 / frequency, 1 / fre
 
 # Functions
 def discount_factor(t, r=risk_free_rate):
-    return np.exp(-r * t)
+    return curves.discount_factor(r, t)
 
 
 def survival_probability(t, h=hazard_rate):
-    return np.exp(-h * t)
+    return curves.survival_probability(h, t)
 
 
 def default_probability(t1, t0, h=hazard_rate):
@@ -33,22 +36,11 @@ def default_probability(t1, t0, h=hazard_rate):
 
 
 # Calculate price under survival-based model
+# Expected coupons and principal if no default, plus expected recovery if default occurs between periods
 def survival_based_bond_price():
-    price = 0
-    for t in payment_times:
-        # Expected coupon and principal if no default
-        cashflow = (face_value * coupon_rate / frequency)
-        price += cashflow * discount_factor(t) * survival_probability(t)
-
-    # Add expected principal repayment at maturity
-    price += face_value * discount_factor(maturity_years) * survival_probability(maturity_years)
-
-    # Add expected recovery value if default occurs between periods
-    for t in payment_times:
-        dp = default_probability(t, t - 1 / frequency)
-        price += face_value * recovery_rate * discount_factor(t) * dp
-
-    return price
+    return pricing_kernels.survival_price(face_value, face_value * coupon_rate / frequency, recovery_rate,
+                                          risk_free_rate, hazard_rate, payment_times, payment_times - 1 / frequency,
+                                          maturity_years)
 
 
 # Calculate theta (1-day passage of time)
@@ -77,11 +69,16 @@ def calculate_theta():
 
 
 # Run the calculation
-price_today, price_tomorrow, theta = calculate_theta()
+def main():
+    price_today, price_tomorrow, theta = calculate_theta()
+
+    import ace_tools as tools
+
+    tools.display_dataframe_to_user(name="Bond Theta Example", dataframe=pd.DataFrame({
+        'Metric': ['Price Today', 'Price Tomorrow (1-day later)', 'Theta (PnL from Time Passage)'],
+        'Value': [price_today, price_tomorrow, theta]
+    }))
 
-import ace_tools as tools;
 
-tools.display_dataframe_to_user(name="Bond Theta Example", dataframe=pd.DataFrame({
-    'Metric': ['Price Today', 'Price Tomorrow (1-day later)', 'Theta (PnL from Time Passage)'],
-    'Value': [price_today, price_tomorrow, theta]
-}))
+if __name__ == "__main__":
+    main()
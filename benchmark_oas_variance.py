@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from oas_engine import oas_model_batch
+
+BOND = dict(face_value=100, coupon_rate=0.05, years=5, call_price=100, call_year=3, r0=0.03, sigma=0.3)
+SPREADS = np.linspace(0.0, 0.1, 20)
+ESTIMATORS = {
+    # name: keyword options for oas_model_batch
+    'Pseudo MC': dict(),
+    'Antithetic': dict(antithetic=True),
+    'Control Variate': dict(control_variate=True),
+    'Antithetic + CV': dict(antithetic=True, control_variate=True),
+    'Sobol + Bridge': dict(sampler='sobol'),
+    'Sobol + Bridge + CV': dict(sampler='sobol', control_variate=True),
+}
+
+
+def reference_prices(n_paths=2 ** 18):
+    return oas_model_batch(**BOND, oas_spreads=SPREADS, n_paths=n_paths, rng=2024, sampler='sobol',
+                           control_variate=True, return_stderr=True)
+
+
+def evaluate(options, n_paths, reference, n_seeds=20):
+    """Realised RMSE against the reference, mean reported standard error and time per OAS curve."""
+    errors, stderrs = [], []
+    start = time.perf_counter()
+    for seed in range(n_seeds):
+        price, stderr = oas_model_batch(**BOND, oas_spreads=SPREADS, n_paths=n_paths, rng=seed, return_stderr=True,
+                                        **options)
+        errors.append(price - reference)
+        stderrs.append(stderr)
+    elapsed = (time.perf_counter() - start) / n_seeds
+    return np.sqrt(np.mean(np.square(errors))), np.mean(stderrs), elapsed
+
+
+# --- Main Execution ---
+
+def main():
+    reference, reference_stderr = reference_prices()
+    print(f"\n📊 Callable Bond OAS Curve: reference from 2^18 Sobol paths (max stderr {reference_stderr.max():.1e})\n")
+
+    rows = []
+    for n_paths in (1024, 4096):
+        baseline_rmse = None
+        for name, options in ESTIMATORS.items():
+            rmse, stderr, elapsed = evaluate(options, n_paths, reference)
+            baseline_rmse = baseline_rmse or rmse
+            rows.append({'Estimator': name, 'Paths': n_paths, 'RMSE': rmse, 'Reported SE': stderr,
+                         'ms / Curve': elapsed * 1e3, 'Path Saving (x)': (baseline_rmse / rmse) ** 2})
+    print(pd.DataFrame(rows).round({'RMSE': 5, 'Reported SE': 5, 'ms / Curve': 2, 'Path Saving (x)': 1})
+          .to_string(index=False))
+
+    # Same accuracy, fewer paths: plain MC on 10,000 paths vs Sobol + CV on 512
+    plain = oas_model_batch(**BOND, oas_spreads=SPREADS, n_paths=10_000, rng=42)
+    smooth = oas_model_batch(**BOND, oas_spreads=SPREADS, n_paths=512, rng=42, sampler='sobol', control_variate=True)
+    print("\n📊 NPV vs OAS: 10,000 pseudo paths vs 512 Sobol + CV paths\n")
+    print(pd.DataFrame({'OAS (bps)': SPREADS * 1e4, 'Reference': reference, 'Pseudo 10,000': plain,
+                        'Sobol + CV 512': smooth}).round(4).to_string(index=False))
+    print(f"\nMax |error|: pseudo {np.abs(plain - reference).max():.5f}, "
+          f"Sobol + CV {np.abs(smooth - reference).max():.5f}")
+
+
+if __name__ == "__main__":
+    main()
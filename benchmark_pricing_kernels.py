@@ -0,0 +1,74 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import pricing_kernels
+from benchmark_survival_batch import make_book, time_it
+from BondPricing_RiskBond_RecoverySensitivity import survival_based_pricing
+
+
+def price_reference(book):
+    """Uncompiled per-period loop: the original survival_based_pricing formula."""
+    return np.array([pricing_kernels._flat_bond_loop(row.face_value, row.coupon_rate, row.years, row.risk_free_rate,
+                                                     row.hazard_rate, row.recovery_rate, float(row.frequency))
+                     for row in book.itertuples(index=False)])
+
+
+def price_book(book):
+    return pricing_kernels.flat_book_price(book['face_value'].values, book['coupon_rate'].values,
+                                           book['years'].values, book['risk_free_rate'].values,
+                                           book['hazard_rate'].values, book['recovery_rate'].values,
+                                           book['frequency'].values)
+
+
+def single_bond_latency(n_calls=20_000):
+    """Median per-call latency (microseconds) of the survival_based_pricing entry point."""
+    args = (100.0, 0.05, 10.0, 0.03, 0.02, 0.4, 2)
+    survival_based_pricing(*args)
+    timings = np.empty(n_calls)
+    for i in range(n_calls):
+        start = time.perf_counter()
+        survival_based_pricing(*args)
+        timings[i] = time.perf_counter() - start
+    return np.median(timings) * 1e6, np.percentile(timings, 99) * 1e6
+
+
+# --- Main Execution ---
+
+def main():
+    reference_book = make_book(2_000, seed=1)
+    reference = price_reference(reference_book)
+
+    rows = []
+    for backend in pricing_kernels.available_backends():
+        pricing_kernels.set_backend(backend)
+        start = time.perf_counter()
+        parity = np.max(np.abs(price_book(reference_book) - reference))
+        warm_up = time.perf_counter() - start
+        median_us, p99_us = single_bond_latency()
+        row = {'Backend': backend, 'First Call (s)': round(warm_up, 3), 'Max |Diff|': parity,
+               'Bond p50 (µs)': round(median_us, 2), 'Bond p99 (µs)': round(p99_us, 2)}
+        for n_bonds in [10_000, 1_000_000]:
+            _, elapsed = time_it(price_book, make_book(n_bonds))
+            row[f'{n_bonds:,} (bonds/s)'] = round(n_bonds / elapsed)
+        rows.append(row)
+
+    print(f"\n📊 Pricing Kernel Backends (numba installed: {pricing_kernels.HAS_NUMBA})\n")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+    parity = pricing_kernels.check_parity()
+    print("\n📊 Backend Parity vs NumPy\n")
+    print(parity.to_string(index=False))
+
+    failures = [f"{row['Backend']} vs loop" for row in rows if row['Max |Diff|'] > pricing_kernels.PARITY_TOLERANCE]
+    failures += [f"{b} {e}" for b, e in parity.loc[~parity['OK'], ['Backend', 'Entry Point']].values]
+    if failures:
+        print(f"\n⚠️  Parity beyond {pricing_kernels.PARITY_TOLERANCE:g}: " + ", ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
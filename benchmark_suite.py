@@ -0,0 +1,302 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib.machinery import SourceFileLoader
+
+import numpy as np
+import pandas as pd
+
+import pricing_kernels
+import Theta_v1
+from benchmark_survival_batch import make_book
+from BondPricing_RiskBond_RecoverySensitivity import oas_model, rating_based_pricing, survival_based_pricing
+from discounting import valuation_zero_coupon_bond
+from oas_engine import oas_model_batch
+from rating_migration import ANNUAL_MIGRATION, RATINGS, RatingMigration, rating_migration_pricing
+from survival_batch import survival_based_pricing_batch
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SIZES = [1, 100, 10_000, 100_000, 1_000_000]
+BASELINE_PATH = os.path.join(HERE, "benchmark_baselines.json")
+TIME_BUDGET = 2.0  # seconds of timed calls per case and size
+MAX_REPEAT = 50
+
+
+def _load_module(name, file_name):
+    """Import a repo script whose file name is not a valid module name (hyphens, .text)."""
+    path = os.path.join(HERE, file_name)
+    loader = SourceFileLoader(name, path)
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+# --- Benchmark Cases ---
+# Each case builds a zero-argument callable that prices (or scans) n items; the cap bounds the
+# sizes at which the per-item Python entry points are run.
+
+def _survival_loop(n):
+    book = make_book(n)
+    rows = list(book.itertuples(index=False))
+    return lambda: [survival_based_pricing(r.face_value, r.coupon_rate, r.years, r.risk_free_rate, r.hazard_rate,
+                                           r.recovery_rate, int(r.frequency)) for r in rows]
+
+
+def _survival_batch(n):
+    book = make_book(n)
+    columns = [book[c].values for c in book.columns]
+    return lambda: survival_based_pricing_batch(*columns)
+
+
+def _kernel_book(n):
+    book = make_book(n)
+    columns = [book[c].values for c in book.columns]
+    return lambda: pricing_kernels.flat_book_price(*columns)
+
+
+def _oas_loop(n):
+    spreads = np.linspace(0.0, 0.1, n)
+    return lambda: [oas_model(100, 0.05, 5, s, 100, 3) for s in spreads]
+
+
+def _oas_batch(n):
+    spreads = np.linspace(0.0, 0.1, n)
+    return lambda: oas_model_batch(100, 0.05, 5, spreads, 100, 3, rng=42)
+
+
+def _oas_sobol_cv(n):
+    spreads = np.linspace(0.0, 0.1, n)
+    return lambda: oas_model_batch(100, 0.05, 5, spreads, 100, 3, n_paths=1024, rng=42, sampler='sobol',
+                                   control_variate=True)
+
+
+def _rating_loop(n):
+    recovery = np.random.default_rng(0).uniform(0.1, 0.9, size=n)
+    defaults = [0.02, 0.025, 0.03, 0.035, 0.04]
+    return lambda: [rating_based_pricing(100, 0.05, 5, defaults, r, 0.03) for r in recovery]
+
+
+def _rating_migration(n):
+    rng = np.random.default_rng(0)
+    migration = RatingMigration(ANNUAL_MIGRATION)
+    ratings = rng.choice(RATINGS[:-1], size=n)
+    years = rng.integers(1, 11, size=n).astype(float)
+    return lambda: rating_migration_pricing(100, 0.05, years, ratings, 0.4, 0.03, migration)
+
+
+def _npv_formula(name):
+    def make(n):
+        module = _load_module("survival_based_v1_vs2", "Survival-Based_v1_vs2.py")
+        formula = getattr(module, name)
+        hazards = np.random.default_rng(0).uniform(0.01, 0.4, size=n)
+        return lambda: [formula(100, 0.05, 0.03, h, 0.4, module.time_steps) for h in hazards]
+    return make
+
+
+def _theta(n):
+    return lambda: [Theta_v1.calculate_theta() for _ in range(n)]
+
+
+def _zero_coupon(n):
+    rng = np.random.default_rng(0)
+    rate, ttm = rng.uniform(0.0, 0.08, size=n), rng.uniform(0.01, 30, size=n)
+    convention = rng.choice(['annual', 'semi-annual', 'continuous', 'simple', 'act/360'], size=n)
+    return lambda: valuation_zero_coupon_bond(100.0, rate, ttm, convention)
+
+
+def _folder_scan(n):
+    """n rows per report across the three EOD report layouts, scanned cold (no manifest)."""
+    check1 = _load_module("check1", "check1.text")
+    folder = tempfile.mkdtemp(prefix="dependency_reports_")
+    rng = np.random.default_rng(0)
+    for source, (pattern, namespace_col, samples) in check1.EOD_PATTERNS.items():
+        frame = pd.DataFrame({namespace_col: rng.choice([f"ns{i}" for i in range(50)], size=n)})
+        for column in samples.values():
+            frame[column] = "sample"
+        frame.to_csv(os.path.join(folder, pattern.replace("*", "_")), index=False)
+
+    def run():
+        return check1.process_folder(folder, eod=True, manifest={}, n_workers=1)
+    run.cleanup = lambda: shutil.rmtree(folder, ignore_errors=True)
+    return run
+
+
+CASES = {
+    # name: (builder, largest size, unit)
+    'survival_based_pricing': (_survival_loop, 1_000_000, 'bonds'),
+    'survival_based_pricing_batch': (_survival_batch, 100_000, 'bonds'),
+    'pricing_kernels.flat_book_price': (_kernel_book, 1_000_000, 'bonds'),
+    'oas_model': (_oas_loop, 100, 'bonds'),
+    'oas_model_batch': (_oas_batch, 10_000, 'bonds'),
+    'oas_model_batch (sobol + cv)': (_oas_sobol_cv, 10_000, 'bonds'),
+    'rating_based_pricing': (_rating_loop, 10_000, 'bonds'),
+    'rating_migration_pricing': (_rating_migration, 100_000, 'bonds'),
+    'npv_formula_1': (_npv_formula('npv_formula_1'), 10_000, 'bonds'),
+    'npv_formula_2': (_npv_formula('npv_formula_2'), 10_000, 'bonds'),
+    'calculate_theta': (_theta, 10_000, 'bonds'),
+    'valuation_zero_coupon_bond': (_zero_coupon, 1_000_000, 'bonds'),
+    'check1.process_folder': (_folder_scan, 1_000_000, 'rows'),
+}
+
+
+# --- Measurement ---
+
+def measure(run, n, repeat=None):
+    """
+    Time repeated calls of run (after one warm-up call) and its peak traced memory.
+
+    Calls repeat until TIME_BUDGET is spent (at least 3, at most MAX_REPEAT) unless repeat is given.
+    Peak memory comes from a separate tracemalloc run, so tracing does not distort the timings.
+
+    Returns:
+        dict: Calls, latency percentiles per call (ms), throughput (items/s) and peak memory (MB).
+    """
+    run()
+    timings = []
+    budget_end = time.perf_counter() + TIME_BUDGET
+    while len(timings) < (repeat or MAX_REPEAT):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        if repeat is None and len(timings) >= 3 and time.perf_counter() > budget_end:
+            break
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = np.array(timings)
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        'Calls': len(timings),
+        'p50 (ms)': p50 * 1e3,
+        'p95 (ms)': p95 * 1e3,
+        'p99 (ms)': p99 * 1e3,
+        'Per Item (µs)': p50 / n * 1e6,
+        'Throughput (/s)': n / p50,
+        'Peak Memory (MB)': peak / 2 ** 20,
+    }
+
+
+def run_suite(cases=None, sizes=SIZES, max_size=None, repeat=None, verbose=True):
+    """Run every case at every size up to its cap (and max_size); one row per (case, size)."""
+    rows = []
+    for name in cases or CASES:
+        builder, cap, unit = CASES[name]
+        for n in sizes:
+            if n > cap or (max_size and n > max_size):
+                continue
+            run = builder(n)
+            try:
+                rows.append({'Case': name, 'Size': n, 'Unit': unit, **measure(run, n, repeat)})
+            finally:
+                getattr(run, 'cleanup', lambda: None)()
+            if verbose:
+                row = rows[-1]
+                print(f"  {name:<34} {n:>9,} {unit:<5} p50 {row['p50 (ms)']:>10.3f} ms  "
+                      f"{row['Throughput (/s)']:>14,.0f} /s  {row['Peak Memory (MB)']:>8.1f} MB", flush=True)
+    return pd.DataFrame(rows)
+
+
+# --- Baselines ---
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'processor': platform.processor(), 'cpus': os.cpu_count(), 'backend': pricing_kernels.get_backend()}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Write results as a JSON baseline keyed by 'case|size', merged into an existing file."""
+    baseline = load_baseline(path)
+    baseline['environment'] = environment()
+    baseline['saved'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    entries = baseline.setdefault('results', {})
+    for row in results.to_dict('records'):
+        entries[f"{row['Case']}|{row['Size']}"] = {
+            'throughput': row['Throughput (/s)'], 'p50_ms': row['p50 (ms)'], 'p99_ms': row['p99 (ms)'],
+            'peak_mb': row['Peak Memory (MB)']}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(baseline, f, indent=1)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_baseline(path=BASELINE_PATH):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def compare(results, baseline, tolerance=0.2, memory_tolerance=0.2):
+    """
+    Flag each row against the baseline: 'regression' when throughput falls, or peak memory rises, by
+    more than the tolerance; 'improvement' when throughput rises by more than it; otherwise 'ok'.
+    Rows without a baseline entry are 'new'.
+    """
+    entries = baseline.get('results', {})
+    change, memory_change, status = [], [], []
+    for row in results.to_dict('records'):
+        entry = entries.get(f"{row['Case']}|{row['Size']}")
+        if entry is None:
+            change.append(np.nan)
+            memory_change.append(np.nan)
+            status.append('new')
+            continue
+        speed = row['Throughput (/s)'] / entry['throughput'] - 1
+        memory = (row['Peak Memory (MB)'] - entry['peak_mb']) / max(entry['peak_mb'], 1.0)
+        change.append(100 * speed)
+        memory_change.append(100 * memory)
+        if speed < -tolerance or memory > memory_tolerance:
+            status.append('regression')
+        elif speed > tolerance:
+            status.append('improvement')
+        else:
+            status.append('ok')
+    return results.assign(**{'Throughput Change %': change, 'Memory Change %': memory_change, 'Status': status})
+
+
+# --- Main Execution ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the repo's pricers against JSON baselines.")
+    parser.add_argument('--cases', nargs='*', choices=list(CASES), help="cases to run (default: all)")
+    parser.add_argument('--max-size', type=int, help="skip sizes above this")
+    parser.add_argument('--repeat', type=int, help="fixed number of timed calls per size")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="JSON baseline file")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="relative throughput change treated as noise")
+    parser.add_argument('--memory-tolerance', type=float, default=0.2,
+                        help="relative peak-memory increase treated as noise")
+    args = parser.parse_args(argv)
+
+    print(f"\n📊 Benchmark Suite ({pricing_kernels.get_backend()} backend, Python {platform.python_version()})\n")
+    results = compare(run_suite(args.cases, max_size=args.max_size, repeat=args.repeat),
+                      load_baseline(args.baseline), args.tolerance, args.memory_tolerance)
+    columns = ['Case', 'Size', 'p50 (ms)', 'p99 (ms)', 'Per Item (µs)', 'Throughput (/s)', 'Peak Memory (MB)',
+               'Throughput Change %', 'Status']
+    print("\n📊 Results vs Baseline\n")
+    print(results[columns].to_string(index=False, float_format=lambda x: f"{x:,.3f}"))
+
+    regressions = results[results['Status'] == 'regression']
+    if args.save_baseline:
+        print(f"\nBaseline saved to {save_baseline(results, args.baseline)}")
+    if not regressions.empty:
+        print(f"\n⚠️  {len(regressions)} regression(s) beyond {args.tolerance:.0%} throughput / "
+              f"{args.memory_tolerance:.0%} memory: "
+              + ", ".join(f"{c} @ {s:,}" for c, s in zip(regressions['Case'], regressions['Size'])))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from curves import TermStructure, discount_factor, survival_probability
+from discounting import valuation_zero_coupon_bond
+
+DAY_COUNTS = ('act/360', 'act/365', '30/360', 'act/act')
+CURVE_BASES = {'act/360': 360.0, 'act/365': 365.0}
+
+
+# --- Dates and Day Counts ---
+
+def _as_dates(dates):
+    return np.asarray(dates, dtype='datetime64[D]')
+
+
+def _ymd(dates):
+    months = dates.astype('datetime64[M]')
+    year = dates.astype('datetime64[Y]').astype(int) + 1970
+    month = months.astype(int) % 12 + 1
+    day = (dates - months.astype('datetime64[D]')).astype(int) + 1
+    return year, month, day
+
+
+def _days_in_year(year):
+    return np.where((year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0)), 366.0, 365.0)
+
+
+def year_fraction(start, end, convention='act/365'):
+    """
+    Year fraction between dates (vectorized, broadcasting start, end and convention).
+
+    Conventions: 'act/360', 'act/365' (fixed), '30/360' (US bond basis) and 'act/act' (ISDA: days in
+    each calendar year over that year's length).
+    """
+    start, end, convention = np.broadcast_arrays(_as_dates(start), _as_dates(end), np.asarray(convention))
+    unknown = set(np.unique(convention)) - set(DAY_COUNTS)
+    if unknown:
+        raise ValueError(f"Unsupported day count(s): {sorted(unknown)}.")
+    days = (end - start).astype(float)
+    out = np.empty(start.shape)
+    for name in np.unique(convention):
+        rows = convention == name
+        s, e = start[rows], end[rows]
+        if name == 'act/360':
+            out[rows] = days[rows] / 360
+        elif name == 'act/365':
+            out[rows] = days[rows] / 365
+        elif name == '30/360':
+            y1, m1, d1 = _ymd(s)
+            y2, m2, d2 = _ymd(e)
+            d1 = np.minimum(d1, 30)
+            d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+            out[rows] = (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360
+        else:
+            y1, y2 = _ymd(s)[0], _ymd(e)[0]
+            next_year = (y1 + 1 - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+            this_year = (y2 - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+            split = ((next_year - s).astype(float) / _days_in_year(y1) + (y2 - y1 - 1)
+                     + (e - this_year).astype(float) / _days_in_year(y2))
+            out[rows] = np.where(y1 == y2, days[rows] / _days_in_year(y1), split)
+    return out
+
+
+def add_months(dates, months):
+    """Shift dates by whole months, clamping to the end of shorter months (31-Aug - 6M = 28/29-Feb)."""
+    dates = _as_dates(dates)
+    month_start = dates.astype('datetime64[M]')
+    offset = (dates - month_start.astype('datetime64[D]')).astype(int)
+    target = month_start + np.asarray(months)
+    length = ((target + 1).astype('datetime64[D]') - target.astype('datetime64[D]')).astype(int)
+    return target.astype('datetime64[D]') + np.minimum(offset, length - 1)
+
+
+def business_dates(start, n_days, holidays=None):
+    """start (rolled forward to a business day) and the next n_days business days."""
+    holidays = [] if holidays is None else _as_dates(holidays)
+    return np.busday_offset(_as_dates(start), np.arange(n_days + 1), roll='forward', holidays=holidays)
+
+
+def coupon_schedule(settlement, maturity, frequency=2):
+    """
+    Coupon dates rolled back from maturity every 12 / frequency months.
+
+    Returns:
+        tuple: (payment_dates, mask, previous_coupon) with the future dates padded to (N x K) in
+        ascending order and previous_coupon the last coupon date on or before settlement.
+    """
+    settlement = _as_dates(settlement)
+    maturity = np.atleast_1d(_as_dates(maturity))
+    frequency = np.broadcast_to(np.asarray(frequency, dtype=int), maturity.shape)
+    if np.any(12 % frequency):
+        raise ValueError("Frequency must divide 12 (1, 2, 3, 4, 6 or 12).")
+    if np.any(maturity <= settlement):
+        raise ValueError("Maturities must be after settlement.")
+    step = 12 // frequency
+    months_left = ((maturity.astype('datetime64[M]') - settlement.astype('datetime64[M]')).astype(int))
+    k = np.arange((months_left // step).max() + 2)
+    rolled = add_months(maturity[:, None], -k * step[:, None])              # descending from maturity
+    n_future = (rolled > settlement).sum(axis=1)
+    j = np.arange(n_future.max())
+    mask = j < n_future[:, None]
+    index = np.clip(n_future[:, None] - 1 - j, 0, None)
+    payment_dates = np.where(mask, np.take_along_axis(rolled, index, axis=1), maturity[:, None])
+    previous_coupon = rolled[np.arange(len(maturity)), n_future]
+    return payment_dates, mask, previous_coupon
+
+
+# --- Carry Engine ---
+
+class CarryEngine:
+    """
+    Date-aware accrued, theta, carry and roll-down for a portfolio over a horizon of business days.
+
+    The coupon schedule, coupon amounts (on each bond's day count) and payment times are built once at
+    settlement. Every horizon date is priced on the same grid, with the remaining flows found by
+    comparing payment dates to the horizon date, so a 21-day horizon costs one vectorized pass instead
+    of 21 full reprices. Survival pricing matches the rest of the repo: coupons and principal weighted
+    by survival, recovery on default within each remaining coupon period (the period running into a
+    horizon date starts at the horizon date).
+
+    roll='static' keeps the curves fixed as functions of time from the horizon date, which is what
+    produces roll-down; roll='forward' lets the rate and hazard forwards realize (D_h(T) = D(T) / D(h),
+    S_h(T) = S(T) / S(h)), reusing the single curve evaluations at settlement.
+    """
+
+    def __init__(self, settlement, maturity, coupon_rate, face_value=100.0, frequency=2, day_count='30/360',
+                 risk_free_rate=0.03, hazard_rate=0.0, recovery_rate=0.4, curve_basis='act/365'):
+        if curve_basis not in CURVE_BASES:
+            raise ValueError("Curve basis must be 'act/360' or 'act/365'.")
+        self.settlement = _as_dates(settlement)
+        self.maturity = np.atleast_1d(_as_dates(maturity))
+        n_bonds = len(self.maturity)
+        self.coupon_rate, self.face_value, self.recovery_rate = (
+            np.broadcast_to(np.asarray(x, dtype=float), (n_bonds,)) for x in (coupon_rate, face_value, recovery_rate))
+        self.frequency = np.broadcast_to(np.asarray(frequency, dtype=int), (n_bonds,))
+        self.day_count = np.broadcast_to(np.asarray(day_count), (n_bonds,))
+        self.hazard_rate = self._per_bond(hazard_rate, n_bonds)
+        self.risk_free_rate = self._per_bond(risk_free_rate, n_bonds)
+        self.curve_basis = curve_basis
+
+        self.payment_dates, self.mask, self.previous_coupon = coupon_schedule(self.settlement, self.maturity,
+                                                                              self.frequency)
+        period_start = np.column_stack([self.previous_coupon, self.payment_dates[:, :-1]])
+        accrual = year_fraction(period_start, self.payment_dates, self.day_count[:, None])
+        self.coupon = np.where(self.mask, self.face_value[:, None] * self.coupon_rate[:, None] * accrual, 0.0)
+        self.period_start = period_start
+        basis = CURVE_BASES[curve_basis]
+        self.payment_times = (self.payment_dates - self.settlement).astype(float) / basis
+        self.start_times = (period_start - self.settlement).astype(float) / basis
+        self._settlement_discount = discount_factor(self._expand(self.risk_free_rate, 2), self.payment_times)
+        self._settlement_survival = survival_probability(self._expand(self.hazard_rate, 2), self.payment_times)
+
+    @staticmethod
+    def _per_bond(rate, n_bonds):
+        if isinstance(rate, TermStructure):
+            return rate
+        return np.broadcast_to(np.asarray(rate, dtype=float), (n_bonds,))
+
+    @staticmethod
+    def _expand(rate, ndim):
+        """Per-bond rates shaped to broadcast against (N x K) or (N x K x H) grids; curves pass through."""
+        if isinstance(rate, TermStructure):
+            return rate
+        return rate.reshape((-1,) + (1,) * (ndim - 1))
+
+    def accrued(self, dates):
+        """Accrued interest per bond at each date (N x H), on each bond's day count."""
+        dates = np.atleast_1d(_as_dates(dates))
+        passed = (self.payment_dates[:, :, None] <= dates) & self.mask[:, :, None]
+        # latest coupon date on or before each horizon date: previous coupon, then paid coupon dates
+        anchors = np.concatenate([self.previous_coupon[:, None], self.payment_dates], axis=1)
+        last = np.take_along_axis(anchors, passed.sum(axis=1), axis=1)
+        fraction = year_fraction(last, dates[None, :], self.day_count[:, None])
+        return np.where(dates[None, :] < self.maturity[:, None],
+                        self.face_value[:, None] * self.coupon_rate[:, None] * fraction, 0.0)
+
+    def cash_received(self, dates):
+        """Contractual coupons and principal paid in (settlement, date] per bond (N x H), assuming no default."""
+        dates = np.atleast_1d(_as_dates(dates))
+        paid = (self.payment_dates[:, :, None] <= dates) & self.mask[:, :, None]
+        principal = np.where(self.maturity[:, None] <= dates, self.face_value[:, None], 0.0)
+        return (self.coupon[:, :, None] * paid).sum(axis=1) + principal
+
+    def dirty_price(self, dates, roll='static'):
+        """Survival-based dirty price per bond at each horizon date (N x H) with unchanged market inputs."""
+        dates = np.atleast_1d(_as_dates(dates))
+        horizon = (dates - self.settlement).astype(float) / CURVE_BASES[self.curve_basis]
+        live = self.mask[:, :, None] & (self.payment_dates[:, :, None] > dates)
+        tau = np.maximum(self.payment_times[:, :, None] - horizon, 0.0)
+        tau_start = np.maximum(self.start_times[:, :, None] - horizon, 0.0)
+        hazard = self._expand(self.hazard_rate, 3)
+        if roll == 'static':
+            discount = discount_factor(self._expand(self.risk_free_rate, 3), tau)
+            survival = survival_probability(hazard, tau)
+            survival_start = survival_probability(hazard, tau_start)
+        elif roll == 'forward':
+            today = discount_factor(self._expand(self.risk_free_rate, 3), horizon[None, None, :])
+            discount = self._settlement_discount[:, :, None] / today
+            alive = survival_probability(hazard, horizon[None, None, :])
+            survival = self._settlement_survival[:, :, None] / alive
+            survival_start = survival_probability(hazard, np.maximum(self.start_times[:, :, None], horizon)) / alive
+        else:
+            raise ValueError("roll must be 'static' or 'forward'.")
+
+        is_last = self.payment_dates == self.maturity[:, None]
+        flows = (self.coupon[:, :, None] + np.where(is_last, self.face_value[:, None], 0.0)[:, :, None]) * survival
+        flows += (self.recovery_rate * self.face_value)[:, None, None] * (survival_start - survival)
+        return np.where(live, flows * discount, 0.0).sum(axis=1)
+
+    def carry_report(self, n_days=1, holidays=None, funding_rate=0.0, roll='static'):
+        """
+        Accrued, clean / dirty price and the time-PnL split at every business day of the horizon.
+
+        With cash the contractual flows received since settlement and funding the cost of financing
+        the settlement dirty price (act/360):
+
+            Carry     = accrued(h) - accrued(0) + cash - funding
+            Roll-Down = clean(h) - clean(0)
+            Theta     = dirty(h) + cash - dirty(0) = Carry + Roll-Down + funding
+
+        Returns:
+            pd.DataFrame: One row per bond and horizon date.
+        """
+        dates = business_dates(self.settlement, n_days, holidays)
+        accrued = self.accrued(dates)
+        dirty = self.dirty_price(dates, roll)
+        cash = self.cash_received(dates)
+        clean = dirty - accrued
+        elapsed = (dates - self.settlement).astype(float)
+        funding = dirty[:, :1] * funding_rate * elapsed / 360
+        carry = accrued - accrued[:, :1] + cash - funding
+        n_bonds = len(self.maturity)
+        return pd.DataFrame({
+            'Bond': np.repeat(np.arange(n_bonds), len(dates)),
+            'Date': np.tile(dates, n_bonds),
+            'Days': np.tile(elapsed.astype(int), n_bonds),
+            'Accrued': accrued.ravel(),
+            'Clean': clean.ravel(),
+            'Dirty': dirty.ravel(),
+            'Cash Received': cash.ravel(),
+            'Carry': carry.ravel(),
+            'Roll-Down': (clean - clean[:, :1]).ravel(),
+            'Theta': (dirty + cash - dirty[:, :1]).ravel(),
+        })
+
+
+# --- Main Execution ---
+
+def main():
+    # Theta_v1's distressed bond on real dates: settle Friday 13-Jun-2025, one business day is Monday
+    engine = CarryEngine('2025-06-13', '2030-06-13', 0.08, frequency=2, day_count='30/360', risk_free_rate=0.03,
+                         hazard_rate=0.25, recovery_rate=0.4)
+    report = engine.carry_report(n_days=5)
+    print("\n📊 Distressed Bond (8% semi, 25% hazard): Daily Theta on Real Dates\n")
+    print(report.drop(columns='Bond').round(dict.fromkeys(report.columns[3:], 6)).to_string(index=False))
+
+    import Theta_v1
+    price_today, _, theta_252 = Theta_v1.calculate_theta()
+    print(f"\nTheta_v1 (1/252 year, no accrual split): price {price_today:.6f}, theta {theta_252:.6f}")
+    print(f"Engine (Fri -> Mon, 3 calendar days):  dirty {report['Dirty'].iloc[0]:.6f}, "
+          f"theta {report['Theta'].iloc[1]:.6f}")
+
+    # The cleanPnL zero-coupon example on dates instead of 359 / 360
+    zero = CarryEngine('2025-01-02', '2026-01-02', 0.0, day_count='act/360', risk_free_rate=np.log(1.04),
+                       curve_basis='act/360')
+    row = zero.carry_report(n_days=1).iloc[1]
+    by_hand = valuation_zero_coupon_bond(100, 0.04, 359 / 360) - valuation_zero_coupon_bond(100, 0.04, 1.0)
+    print(f"\n📊 Zero Coupon (4%): 1-day theta {row['Theta']:.6f} to {row['Date'].date()} "
+          f"(cleanPnL 359/360: {by_hand:.6f})\n")
+
+    # Portfolio: 21-business-day horizon in one pass vs one full engine build and reprice per date
+    rng = np.random.default_rng(0)
+    n_bonds = 5_000
+    maturity = np.datetime64('2025-06-13') + rng.integers(200, 30 * 365, size=n_bonds)
+    kwargs = dict(coupon_rate=rng.uniform(0.01, 0.08, n_bonds), frequency=rng.choice([1, 2, 4], n_bonds),
+                  day_count=rng.choice(['30/360', 'act/act', 'act/365'], n_bonds),
+                  risk_free_rate=rng.uniform(0.01, 0.05, n_bonds), hazard_rate=rng.uniform(0.0, 0.1, n_bonds))
+    start = time.perf_counter()
+    book = CarryEngine('2025-06-13', maturity, **kwargs).carry_report(n_days=21, funding_rate=0.04)
+    engine_time = time.perf_counter() - start
+
+    dates = business_dates('2025-06-13', 21)
+    start = time.perf_counter()
+    repriced = np.column_stack([CarryEngine(date, maturity, **kwargs).dirty_price(date)[:, 0] for date in dates])
+    loop_time = time.perf_counter() - start
+    # a rebuilt engine accrues from its own settlement, so compare dirty prices: the PV of the remaining
+    # cash flows, which does not depend on where accrual starts
+    engine_dirty = book['Dirty'].values.reshape(n_bonds, -1)
+    print(f"📊 {n_bonds:,} Bonds x 22 Horizon Dates: one pass {engine_time:.2f}s vs per-date reprice {loop_time:.2f}s")
+    print(f"Max |dirty diff| vs per-date reprice: {np.max(np.abs(engine_dirty - repriced)):.2e}\n")
+    horizon = book[book['Days'] == book['Days'].max()]
+    print(horizon[['Carry', 'Roll-Down', 'Theta']].describe().round(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
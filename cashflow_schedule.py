@@ -0,0 +1,230 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from survival_batch import build_time_grid
+
+
+# --- Schedule Representation ---
+
+class CashflowSchedule:
+    """
+    Padded (N x max_periods) cash-flow schedules for N bonds.
+
+    Each row holds payment times, coupon and principal amounts, the notional outstanding at the start
+    of each period (the recovery base), and call / put prices per 100 of outstanding (NaN where the
+    option cannot be exercised). Dead padding cells have mask False and zero cash flows.
+    """
+
+    def __init__(self, times, mask, frequency, coupon, principal, outstanding, call_price=None, put_price=None):
+        self.times = times
+        self.mask = mask
+        self.frequency = frequency
+        self.coupon = np.where(mask, coupon, 0.0)
+        self.principal = np.where(mask, principal, 0.0)
+        self.outstanding = np.where(mask, outstanding, 0.0)
+        self.call_price = np.full(times.shape, np.nan) if call_price is None else np.where(mask, call_price, np.nan)
+        self.put_price = np.full(times.shape, np.nan) if put_price is None else np.where(mask, put_price, np.nan)
+        for array in (self.times, self.mask, self.frequency, self.coupon, self.principal, self.outstanding,
+                      self.call_price, self.put_price):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return self.times.shape[0]
+
+    @property
+    def callable(self):
+        return ~np.isnan(self.call_price)
+
+    @property
+    def putable(self):
+        return ~np.isnan(self.put_price)
+
+    @property
+    def cash_flow(self):
+        return self.coupon + self.principal
+
+    @classmethod
+    def concat(cls, schedules):
+        """Stack schedules for different structures into one book, padding to the longest row."""
+        width = max(s.times.shape[1] for s in schedules)
+
+        def pad(name, fill):
+            return np.concatenate([np.pad(getattr(s, name), ((0, 0), (0, width - s.times.shape[1])),
+                                          constant_values=fill) for s in schedules])
+
+        return cls(pad('times', 0.0), pad('mask', False), np.concatenate([s.frequency for s in schedules]),
+                   pad('coupon', 0.0), pad('principal', 0.0), pad('outstanding', 0.0),
+                   pad('call_price', np.nan), pad('put_price', np.nan))
+
+
+# --- Generators ---
+
+def _grid(face_value, coupon_rate, years, frequency):
+    face_value, coupon_rate, years, frequency = (
+        np.atleast_1d(x).astype(float) for x in np.broadcast_arrays(face_value, coupon_rate, years, frequency))
+    t, mask, dt, periods = build_time_grid(years, frequency)
+    # per-year tables index the year a period ends in: (y - 1, y] -> y - 1
+    year_index = np.maximum(np.ceil(t - 1e-9).astype(int) - 1, 0)
+    return face_value, coupon_rate, years, frequency, t, mask, periods, year_index
+
+
+def _per_year(table, year_index, n_bonds):
+    """Look up a per-year table (1-D shared, or N x years) on the period grid; the last year repeats."""
+    table = np.atleast_2d(np.asarray(table, dtype=float))
+    table = np.broadcast_to(table, (n_bonds, table.shape[1]))
+    return np.take_along_axis(table, np.minimum(year_index, table.shape[1] - 1), axis=1)
+
+
+def _bullet_legs(face_value, coupon_rate, frequency, mask, periods):
+    steps = np.arange(mask.shape[1])
+    principal = np.where(steps == periods[:, None] - 1, face_value[:, None], 0.0)
+    outstanding = np.broadcast_to(face_value[:, None], mask.shape)
+    coupon = outstanding * (coupon_rate / frequency)[:, None]
+    return coupon, principal, outstanding
+
+
+def bullet_schedule(face_value, coupon_rate, years, frequency=2):
+    face_value, coupon_rate, years, frequency, t, mask, periods, _ = _grid(face_value, coupon_rate, years, frequency)
+    coupon, principal, outstanding = _bullet_legs(face_value, coupon_rate, frequency, mask, periods)
+    return CashflowSchedule(t, mask, frequency, coupon, principal, outstanding)
+
+
+def call_schedule(face_value, coupon_rate, years, frequency=2, first_call=1, call_prices=100):
+    """Issuer may redeem on coupon dates from first_call on, at per-year call prices (% of par)."""
+    face_value, coupon_rate, years, frequency, t, mask, periods, year_index = _grid(
+        face_value, coupon_rate, years, frequency)
+    coupon, principal, outstanding = _bullet_legs(face_value, coupon_rate, frequency, mask, periods)
+    prices = _per_year(call_prices, year_index, len(years))
+    call_price = np.where(t >= np.atleast_1d(first_call)[:, None] - 1e-9, prices, np.nan)
+    return CashflowSchedule(t, mask, frequency, coupon, principal, outstanding, call_price=call_price)
+
+
+def put_schedule(face_value, coupon_rate, years, frequency=2, first_put=1, put_prices=100):
+    """Investor may redeem on coupon dates from first_put on, at per-year put prices (% of par)."""
+    face_value, coupon_rate, years, frequency, t, mask, periods, year_index = _grid(
+        face_value, coupon_rate, years, frequency)
+    coupon, principal, outstanding = _bullet_legs(face_value, coupon_rate, frequency, mask, periods)
+    prices = _per_year(put_prices, year_index, len(years))
+    put_price = np.where(t >= np.atleast_1d(first_put)[:, None] - 1e-9, prices, np.nan)
+    return CashflowSchedule(t, mask, frequency, coupon, principal, outstanding, put_price=put_price)
+
+
+def sinking_fund_schedule(face_value, coupon_rate, years, frequency=2, sink_start=1):
+    """
+    Equal principal sinks on each anniversary payment date from sink_start to maturity; a bond with no
+    anniversary on or after sink_start (e.g. sink_start past maturity) repays its face at maturity.
+    """
+    face_value, coupon_rate, years, frequency, t, mask, periods, _ = _grid(face_value, coupon_rate, years, frequency)
+    sink_start = np.broadcast_to(np.asarray(sink_start, dtype=float), years.shape)
+    anniversary = mask & (np.abs(t - np.round(t)) < 1e-9) & (t >= sink_start[:, None] - 1e-9)
+    maturity = np.arange(mask.shape[1]) == periods[:, None] - 1
+    anniversary |= maturity & ~anniversary.any(axis=1)[:, None]
+    n_sinks = anniversary.sum(axis=1)
+    principal = np.where(anniversary, (face_value / n_sinks)[:, None], 0.0)
+    outstanding = face_value[:, None] - (np.cumsum(principal, axis=1) - principal)
+    coupon = outstanding * (coupon_rate / frequency)[:, None]
+    return CashflowSchedule(t, mask, frequency, coupon, principal, outstanding)
+
+
+def step_up_schedule(face_value, coupon_steps, years, frequency=2):
+    """Bullet bond whose annual coupon rate follows a per-year table (last step repeats)."""
+    face_value, _, years, frequency, t, mask, periods, year_index = _grid(face_value, 0.0, years, frequency)
+    _, principal, outstanding = _bullet_legs(face_value, np.zeros_like(years), frequency, mask, periods)
+    rates = _per_year(coupon_steps, year_index, len(years))
+    coupon = outstanding * rates / frequency[:, None]
+    return CashflowSchedule(t, mask, frequency, coupon, principal, outstanding)
+
+
+def amortizing_schedule(face_value, coupon_rate, years, frequency=2):
+    """Level principal repayment every period; interest accrues on the declining balance."""
+    face_value, coupon_rate, years, frequency, t, mask, periods, _ = _grid(face_value, coupon_rate, years, frequency)
+    principal = np.where(mask, (face_value / periods)[:, None], 0.0)
+    outstanding = face_value[:, None] - (np.cumsum(principal, axis=1) - principal)
+    coupon = outstanding * (coupon_rate / frequency)[:, None]
+    return CashflowSchedule(t, mask, frequency, coupon, principal, outstanding)
+
+
+def pre_refunded_schedule(face_value, coupon_rate, years, frequency=2, refund_year=5, refund_price=100):
+    """Bond escrowed to refund_year, where it is redeemed at refund_price (% of par)."""
+    face_value, coupon_rate, years, frequency = (
+        np.atleast_1d(x).astype(float) for x in np.broadcast_arrays(face_value, coupon_rate, years, frequency))
+    refund_year = np.minimum(np.broadcast_to(np.asarray(refund_year, dtype=float), years.shape), years)
+    refund_price = np.broadcast_to(np.asarray(refund_price, dtype=float), years.shape)
+    schedule = bullet_schedule(face_value, coupon_rate, refund_year, frequency)
+    principal = schedule.principal * (refund_price / 100)[:, None]
+    return CashflowSchedule(schedule.times, schedule.mask, frequency, schedule.coupon, principal,
+                            schedule.outstanding)
+
+
+STRUCTURES = {
+    'bullet': bullet_schedule,
+    'call': call_schedule,
+    'put': put_schedule,
+    'sinking_fund': sinking_fund_schedule,
+    'step_up': step_up_schedule,
+    'amortizing': amortizing_schedule,
+    'pre_refunded': pre_refunded_schedule,
+}
+
+
+# --- Schedule Cache ---
+
+_schedule_cache = OrderedDict()
+SCHEDULE_CACHE_SIZE = 256
+
+
+def _terms_key(structure, terms):
+    parts = [structure]
+    for name in sorted(terms):
+        value = np.asarray(terms[name])
+        parts.append((name, value.dtype.str, value.shape, value.tobytes()))
+    return tuple(parts)
+
+
+def cached_schedule(structure, **terms):
+    """
+    Build (or reuse) the schedule for a structure and its instrument terms.
+
+    Schedules depend only on terms, never on market data, so intraday repricing hits this cache and
+    never regenerates them. The cache is a bounded LRU keyed on the exact term arrays.
+    """
+    key = _terms_key(structure, terms)
+    schedule = _schedule_cache.get(key)
+    if schedule is not None:
+        _schedule_cache.move_to_end(key)
+        return schedule
+    schedule = STRUCTURES[structure](**terms)
+    _schedule_cache[key] = schedule
+    if len(_schedule_cache) > SCHEDULE_CACHE_SIZE:
+        _schedule_cache.popitem(last=False)
+    return schedule
+
+
+# --- Main Execution ---
+
+def main():
+    from survival_batch import survival_pricing_schedule
+
+    # The six structures from Simulate_CallSchedule_SinkSchedle.py on a 10-year, 1000 par bond
+    terms = dict(face_value=1000, years=10, frequency=1)
+    structures = {
+        'Call Schedule': cached_schedule('call', coupon_rate=0.05, first_call=1, call_prices=[105, 103, 101, 100],
+                                         **terms),
+        'Put Schedule': cached_schedule('put', coupon_rate=0.05, first_put=1, put_prices=100, **terms),
+        'Sinking Fund': cached_schedule('sinking_fund', coupon_rate=0.05, **terms),
+        'Multi-Step Coupon': cached_schedule('step_up', coupon_steps=[0.03, 0.04, 0.05, 0.06, 0.06, 0.07, 0.07, 0.07,
+                                                                      0.08, 0.08], **terms),
+        'Amortized': cached_schedule('amortizing', coupon_rate=0.05, **terms),
+        'Pre-Refunded': cached_schedule('pre_refunded', coupon_rate=0.05, refund_year=5, refund_price=102, **terms),
+    }
+    book = CashflowSchedule.concat(list(structures.values()))
+    npv = survival_pricing_schedule(book, 0.04, 0.02, 0.4)
+
+    print("\n📊 Survival-Based NPV by Structure (4% rate, 2% hazard, 40% recovery)\n")
+    print(pd.DataFrame({'Structure': list(structures), 'NPV ($)': npv}).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
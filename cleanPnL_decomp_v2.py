@@ -1,16 +1,6 @@
-import numpy as np
 import pandas as pd
 
-# Define valuation function for zero-coupon bond
-def valuation_zero_coupon_bond(notional, rate, ttm, convention='annual'):
-    if convention == 'annual':
-        return notional / (1 + rate) ** ttm
-    elif convention == 'semi-annual':
-        return notional / (1 + rate / 2) ** (2 * ttm)
-    elif convention == 'continuous':
-        return notional * np.exp(-rate * ttm)
-    else:
-        raise ValueError("Unsupported compounding convention.")
+from discounting import valuation_zero_coupon_bond
 
 # Inputs
 notional = 100
@@ -1,28 +1,6 @@
-import numpy as np
 import pandas as pd
 
-# Define the valuation function for a zero-coupon bond
-def valuation_zero_coupon_bond(notional, rate, ttm, convention='annual'):
-    """
-    Valuation of a zero-coupon bond using simple compounding.
-
-    Args:
-        notional (float): Face value of the bond.
-        rate (float): Annualized interest rate.
-        ttm (float): Time to maturity in years.
-        convention (str): Compounding convention ('annual', 'semi-annual', 'continuous').
-
-    Returns:
-        float: Present value of the zero-coupon bond.
-    """
-    if convention == 'annual':
-        return notional / (1 + rate) ** ttm
-    elif convention == 'semi-annual':
-        return notional / (1 + rate / 2) ** (2 * ttm)
-    elif convention == 'continuous':
-        return notional * np.exp(-rate * ttm)
-    else:
-        raise ValueError("Unsupported compounding convention.")
+from discounting import valuation_zero_coupon_bond
 
 # Example from the document
 notional = 100  # Face value
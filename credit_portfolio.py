@@ -0,0 +1,228 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from curves import survival_probability
+
+
+# --- Loss Histogram ---
+
+class LossHistogram:
+    """
+    Fixed-bin portfolio loss distribution that is filled incrementally, one scenario chunk at a time.
+
+    Bins span [0, max_loss]; per-bin counts and loss sums (plus the running first two moments) are all
+    that is stored, so memory stays constant however many scenarios are added, and histograms from
+    different chunks or processes merge by addition. Expected loss and ES use the exact loss sums;
+    VaR is resolved to one bin width.
+    """
+
+    def __init__(self, max_loss, n_bins=10_000):
+        self.max_loss = float(max_loss)
+        self.n_bins = n_bins
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.loss_sums = np.zeros(n_bins)
+        self.sum_squares = 0.0
+
+    @property
+    def n_scenarios(self):
+        return int(self.counts.sum())
+
+    @property
+    def edges(self):
+        return np.linspace(0.0, self.max_loss, self.n_bins + 1)
+
+    def update(self, losses):
+        width = self.max_loss / self.n_bins if self.max_loss > 0 else 1.0
+        bins = np.minimum((losses / width).astype(np.int64), self.n_bins - 1)
+        self.counts += np.bincount(bins, minlength=self.n_bins)
+        self.loss_sums += np.bincount(bins, weights=losses, minlength=self.n_bins)
+        self.sum_squares += float(losses @ losses)
+        return self
+
+    def merge(self, other):
+        if other.max_loss != self.max_loss or other.n_bins != self.n_bins:
+            raise ValueError("Histograms must share the same bins to merge.")
+        self.counts += other.counts
+        self.loss_sums += other.loss_sums
+        self.sum_squares += other.sum_squares
+        return self
+
+    def expected_loss(self):
+        return self.loss_sums.sum() / self.n_scenarios
+
+    def std(self):
+        mean = self.expected_loss()
+        return np.sqrt(max(self.sum_squares / self.n_scenarios - mean ** 2, 0.0))
+
+    @staticmethod
+    def _check_quantile(q):
+        if not 0 < q < 1:
+            raise ValueError("Quantile must lie strictly between 0 and 1.")
+
+    def value_at_risk(self, q):
+        """Upper edge of the bin holding the q-quantile of the loss."""
+        self._check_quantile(q)
+        cumulative = np.cumsum(self.counts)
+        return self.edges[1:][np.searchsorted(cumulative, q * self.n_scenarios)]
+
+    def expected_shortfall(self, q):
+        """
+        Mean loss over the worst (1 - q) tail, splitting the bin that straddles the quantile.
+
+        The tail always holds at least one scenario, so quantiles beyond the sample resolution return
+        the mean loss of the worst bin's scenarios rather than dividing by zero.
+        """
+        self._check_quantile(q)
+        n_tail = min(max((1 - q) * self.n_scenarios, 1.0), self.n_scenarios)
+        tail_counts = np.cumsum(self.counts[::-1])
+        k = np.searchsorted(tail_counts, n_tail)
+        if k >= self.n_bins:
+            return self.expected_loss()
+        above = tail_counts[k] - self.counts[::-1][k]
+        straddle = self.loss_sums[::-1][k] / self.counts[::-1][k] * (n_tail - above)
+        return (self.loss_sums[::-1][:k].sum() + straddle) / n_tail
+
+    def summary(self, quantiles=(0.99, 0.999)):
+        row = {'Scenarios': self.n_scenarios, 'Expected Loss': self.expected_loss(), 'Loss Std': self.std()}
+        for q in quantiles:
+            row[f'VaR {q:.1%}'] = self.value_at_risk(q)
+            row[f'ES {q:.1%}'] = self.expected_shortfall(q)
+        return pd.DataFrame([row])
+
+
+# --- Gaussian Copula Simulation ---
+
+def factor_loadings(correlation, n_names):
+    """One-factor loadings sqrt(rho) from an asset correlation per name (scalar or array)."""
+    rho = np.broadcast_to(np.asarray(correlation, dtype=float), (n_names,))
+    if np.any((rho < 0) | (rho >= 1)):
+        raise ValueError("Asset correlation must lie in [0, 1).")
+    return np.sqrt(rho)[:, None]
+
+
+def _simulate_chunk(thresholds, loadings, counts, lgd, n_scenarios, seed, max_loss, n_bins):
+    """
+    Losses for one chunk of scenarios, folded straight into a histogram.
+
+    Names are sorted into groups sharing a threshold and loadings; given the factors, defaults are
+    independent with probability N((threshold - a . Z) / sqrt(1 - |a|^2)), so the conditional PD is
+    evaluated per group and each name only needs one float32 uniform.
+    """
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((n_scenarios, loadings.shape[1]))
+    idiosyncratic = np.sqrt(1 - (loadings ** 2).sum(axis=1))
+    conditional_pd = ndtr((thresholds - factors @ loadings.T) / idiosyncratic).astype(np.float32)
+    defaults = rng.random((n_scenarios, len(lgd)), dtype=np.float32) < np.repeat(conditional_pd, counts, axis=1)
+    return LossHistogram(max_loss, n_bins).update(defaults @ lgd)
+
+
+def simulate_portfolio_loss(exposure, hazard_rate, recovery_rate, horizon=1.0, correlation=None, loadings=None,
+                            n_scenarios=100_000, max_cells=4_000_000, n_bins=10_000, parallel=False, n_workers=None,
+                            seed=None):
+    """
+    Portfolio default-loss distribution under a one- or multi-factor Gaussian copula.
+
+    Name i defaults before the horizon when its latent variable X_i = a_i . Z + sqrt(1 - |a_i|^2) e_i falls
+    below N^-1(1 - Q_i(horizon)), with Q_i the survival probability from the usual hazard inputs; this is
+    the copula default time tau_i = Q_i^-1(N(X_i)) compared with the horizon, drawn conditionally on the
+    factors (one uniform per name, one conditional PD per group of identical names). Scenarios are simulated in
+    chunks of at most max_cells latent draws and folded into a LossHistogram, so memory is fixed
+    regardless of n_scenarios. Each chunk has its own SeedSequence child, so serial and parallel runs
+    (any worker count) return identical histograms.
+
+    Args:
+        exposure (array-like): Exposure at default per name.
+        hazard_rate (array-like or HazardCurve): Hazard per name, or one curve for every name.
+        recovery_rate (array-like): Recovery per name.
+        horizon (float): Loss horizon in years.
+        correlation (float or array-like): One-factor asset correlation (alternative to loadings).
+        loadings (array-like): Factor loadings, shape (n_names, n_factors), rows with norm below one.
+        n_scenarios (int): Number of scenarios.
+        max_cells (int): Upper bound on scenarios x names held in memory per chunk.
+        n_bins (int): Histogram resolution.
+        parallel (bool): Spread the chunks over a ProcessPoolExecutor, at most 2 x n_workers in flight.
+        n_workers (int or None): Process count (default: all cores).
+        seed (int or None): Root seed.
+
+    Returns:
+        LossHistogram: The simulated loss distribution.
+    """
+    exposure = np.atleast_1d(np.asarray(exposure, dtype=float))
+    n_names = len(exposure)
+    recovery_rate = np.broadcast_to(np.asarray(recovery_rate, dtype=float), (n_names,))
+    if (correlation is None) == (loadings is None):
+        raise ValueError("Provide exactly one of correlation or loadings.")
+    loadings = factor_loadings(correlation, n_names) if loadings is None else np.asarray(loadings, dtype=float)
+    if loadings.shape[0] != n_names or np.any((loadings ** 2).sum(axis=1) >= 1):
+        raise ValueError("Loadings need one row per name with squared norm below one.")
+
+    if np.ndim(hazard_rate):
+        hazard_rate = np.broadcast_to(np.asarray(hazard_rate, dtype=float), (n_names,))
+    default_prob = 1 - np.broadcast_to(survival_probability(hazard_rate, horizon), (n_names,))
+    lgd = exposure * (1 - recovery_rate)
+    max_loss = lgd.sum()
+    # group names with identical copula terms so conditional PDs are computed once per group
+    terms, group, counts = np.unique(np.column_stack([ndtri(default_prob), loadings]), axis=0,
+                                     return_inverse=True, return_counts=True)
+    thresholds, loadings = terms[:, 0], terms[:, 1:]
+    lgd = lgd[np.argsort(group.ravel(), kind='stable')]
+    args = (thresholds, loadings, counts, lgd)
+
+    chunk_size = max(1, max_cells // n_names)
+    sizes = [min(chunk_size, n_scenarios - start) for start in range(0, n_scenarios, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    histogram = LossHistogram(max_loss, n_bins)
+    if not parallel:
+        for size, child in zip(sizes, seeds):
+            histogram.merge(_simulate_chunk(*args, size, child, max_loss, n_bins))
+        return histogram
+
+    n_workers = n_workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        in_flight = deque()
+        for size, child in zip(sizes, seeds):
+            if len(in_flight) >= 2 * n_workers:
+                histogram.merge(in_flight.popleft().result())
+            in_flight.append(pool.submit(_simulate_chunk, *args, size, child, max_loss, n_bins))
+        while in_flight:
+            histogram.merge(in_flight.popleft().result())
+    return histogram
+
+
+# --- Main Execution ---
+
+def main():
+    rng = np.random.default_rng(0)
+    n_names = 2_000
+    exposure = rng.choice([1e6, 5e6, 1e7], size=n_names)
+    hazard = rng.choice([0.002, 0.01, 0.03, 0.10], size=n_names, p=[0.3, 0.4, 0.2, 0.1])
+    recovery = rng.uniform(0.2, 0.6, size=n_names)
+    analytic_el = (exposure * (1 - recovery) * (1 - np.exp(-hazard))).sum()
+
+    start = time.perf_counter()
+    one_factor = simulate_portfolio_loss(exposure, hazard, recovery, correlation=0.2, n_scenarios=200_000, seed=7)
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 One-Factor Gaussian Copula ({n_names:,} names, {elapsed:.2f}s, analytic EL {analytic_el:,.0f})\n")
+    print(one_factor.summary().to_string(index=False))
+
+    # Three sector factors on top of a market factor
+    sector = rng.integers(0, 3, size=n_names)
+    loadings = np.zeros((n_names, 4))
+    loadings[:, 0] = np.sqrt(0.15)
+    loadings[np.arange(n_names), 1 + sector] = np.sqrt(0.15)
+    start = time.perf_counter()
+    multi_factor = simulate_portfolio_loss(exposure, hazard, recovery, loadings=loadings, n_scenarios=200_000,
+                                           parallel=True, seed=7)
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 Market + Sector Factor Copula (parallel, {elapsed:.2f}s)\n")
+    print(multi_factor.summary().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
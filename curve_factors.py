@@ -0,0 +1,243 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from curves import discount_factor
+from survival_batch import assemble_legs, build_time_grid, survival_legs
+
+
+# --- Streaming PCA ---
+
+class StreamingPCA:
+    """
+    PCA of spread curves (one column per tenor) whose statistics are updated one day at a time.
+
+    Only the observation count, the running mean and the scatter matrix are stored; a day's block of
+    issuer curves is merged with the parallel-variance update (Chan et al.), so adding a day costs
+    O(issuers x tenors^2) and never touches the history. Components come from an eigen-decomposition of
+    the (tenors x tenors) covariance, recomputed lazily after updates. standardize=True reproduces
+    StandardScaler followed by PCA (correlation-matrix PCA).
+    """
+
+    def __init__(self, n_features, n_components=3, standardize=False):
+        self.n_features = n_features
+        self.n_components = n_components
+        self.standardize = standardize
+        self.n_obs = 0
+        self.mean = np.zeros(n_features)
+        self.scatter = np.zeros((n_features, n_features))
+        self._eigen = None
+
+    def update(self, curves):
+        """Merge a block of curves, shape (n_curves, n_features); rows with missing values are skipped."""
+        curves = np.atleast_2d(np.asarray(curves, dtype=float))
+        curves = curves[~np.isnan(curves).any(axis=1)]
+        n_new = len(curves)
+        if n_new == 0:
+            return self
+        batch_mean = curves.mean(axis=0)
+        centered = curves - batch_mean
+        delta = batch_mean - self.mean
+        total = self.n_obs + n_new
+        self.scatter += centered.T @ centered + np.outer(delta, delta) * self.n_obs * n_new / total
+        self.mean += delta * n_new / total
+        self.n_obs = total
+        self._eigen = None
+        return self
+
+    @property
+    def scale(self):
+        if not self.standardize:
+            return np.ones(self.n_features)
+        std = np.sqrt(np.diag(self.scatter) / self.n_obs)
+        return np.where(std > 0, std, 1.0)
+
+    @property
+    def covariance(self):
+        if self.n_obs < 2:
+            raise ValueError("At least two observations are needed for a covariance.")
+        scale = self.scale
+        return self.scatter / (self.n_obs - 1) / np.outer(scale, scale)
+
+    def _decompose(self):
+        if self._eigen is None:
+            eigenvalues, eigenvectors = np.linalg.eigh(self.covariance)
+            order = np.argsort(eigenvalues)[::-1]
+            eigenvalues, components = np.maximum(eigenvalues[order], 0.0), eigenvectors[:, order].T
+            # deterministic signs: each component loads positively on balance
+            components *= np.where(components.sum(axis=1) < 0, -1.0, 1.0)[:, None]
+            self._eigen = eigenvalues, components
+        return self._eigen
+
+    @property
+    def components(self):
+        return self._decompose()[1][:self.n_components]
+
+    @property
+    def explained_variance(self):
+        return self._decompose()[0][:self.n_components]
+
+    @property
+    def explained_variance_ratio(self):
+        eigenvalues = self._decompose()[0]
+        return eigenvalues[:self.n_components] / eigenvalues.sum()
+
+    def project(self, curves):
+        """Factor scores of new curves on the stored components, shape (n_curves, n_components)."""
+        return ((np.atleast_2d(curves) - self.mean) / self.scale) @ self.components.T
+
+    def reconstruct(self, scores):
+        """Curves rebuilt from factor scores."""
+        return np.atleast_2d(scores) @ self.components * self.scale + self.mean
+
+    def shocks(self, n_scenarios, rng=None, horizon=1.0):
+        """
+        Gaussian curve shocks drawn in factor space: N(0, horizon * variance) per factor, mapped back to
+        tenors. With the PCA fitted on daily changes, horizon is the number of days the shock spans.
+        """
+        rng = np.random.default_rng(rng)
+        scores = rng.standard_normal((n_scenarios, self.n_components)) * np.sqrt(horizon * self.explained_variance)
+        return scores @ self.components * self.scale
+
+
+# --- Randomized PCA ---
+
+def randomized_pca(data, n_components=3, n_oversamples=10, n_power_iter=4, rng=None):
+    """
+    PCA of a wide (n_obs x n_features) matrix by randomized SVD (Halko, Martinsson and Tropp).
+
+    The centered data is sketched onto n_components + n_oversamples random directions, sharpened with a
+    few QR-stabilised power iterations, and only the small projected matrix is decomposed exactly, so
+    cost grows linearly with the number of features instead of a full SVD.
+
+    Returns:
+        tuple: (mean, components, explained_variance) with components of shape (n_components, n_features).
+    """
+    rng = np.random.default_rng(rng)
+    data = np.asarray(data, dtype=float)
+    mean = data.mean(axis=0)
+    centered = data - mean
+    sketch = centered @ rng.standard_normal((data.shape[1], n_components + n_oversamples))
+    basis, _ = np.linalg.qr(sketch)
+    for _ in range(n_power_iter):
+        basis, _ = np.linalg.qr(centered.T @ basis)
+        basis, _ = np.linalg.qr(centered @ basis)
+    _, singular, vt = np.linalg.svd(basis.T @ centered, full_matrices=False)
+    components = vt[:n_components]
+    components *= np.where(components.sum(axis=1) < 0, -1.0, 1.0)[:, None]
+    return mean, components, singular[:n_components] ** 2 / (len(data) - 1)
+
+
+# --- Spread Scenarios to Survival Pricing ---
+
+def spread_survival(tenors, spread_curves, recovery_rate, t):
+    """
+    Survival probabilities at times t implied by spread curves through the credit triangle.
+
+    Each tenor's spread sets the average hazard s / (1 - R) to that tenor, so the cumulative hazard
+    H(T) = T s(T) / (1 - R) at the pillars and is linear in between (piecewise-constant forward hazard,
+    floored at zero). Interpolation weights are shared, so any number of scenario curves is one gather.
+
+    Args:
+        tenors (array-like): Curve pillars in years, increasing.
+        spread_curves (array-like): Spreads, shape (n_scenarios, n_tenors).
+        recovery_rate (float): Recovery used to convert spreads into hazards.
+        t (array-like): Times at which to evaluate survival, shape (n_times,).
+
+    Returns:
+        np.ndarray: Survival probabilities of shape (n_scenarios, n_times).
+    """
+    tenors, t = np.asarray(tenors, dtype=float), np.asarray(t, dtype=float)
+    spread_curves = np.atleast_2d(spread_curves)
+    pillars = np.concatenate([[0.0], tenors])
+    cumulative = np.column_stack([np.zeros(len(spread_curves)), spread_curves * tenors / (1 - recovery_rate)])
+    cumulative = np.maximum.accumulate(cumulative, axis=1)
+    # flat extrapolation of the last forward hazard beyond the longest tenor
+    last_forward = (cumulative[:, -1] - cumulative[:, -2]) / (pillars[-1] - pillars[-2])
+    index = np.clip(np.searchsorted(pillars, t, side='right') - 1, 0, len(tenors) - 1)
+    weight = (t - pillars[index]) / (pillars[index + 1] - pillars[index])
+    hazard_integral = cumulative[:, index] * (1 - weight) + cumulative[:, index + 1] * weight
+    beyond = t > pillars[-1]
+    hazard_integral[:, beyond] = cumulative[:, -1:] + last_forward[:, None] * (t[beyond] - pillars[-1])
+    return np.exp(-hazard_integral)
+
+
+def price_spread_scenarios(face_value, coupon_rate, years, risk_free_rate, tenors, spread_curves, recovery_rate,
+                           frequency=2, legs=False):
+    """
+    Survival-based price of one bond under every scenario spread curve (e.g. base + PCA shocks).
+
+    Returns:
+        np.ndarray or (np.ndarray, pd.DataFrame): Price per scenario, plus the leg breakdown when requested.
+    """
+    spread_curves = np.atleast_2d(spread_curves)
+    n_scenarios = len(spread_curves)
+    t, mask, dt, periods = build_time_grid(np.array([float(years)]), np.array([float(frequency)]))
+    t = t[0]
+    survival_prob = spread_survival(tenors, spread_curves, recovery_rate, t)
+    survival_prev = spread_survival(tenors, spread_curves, recovery_rate, t - dt[0])
+    discount = np.broadcast_to(discount_factor(risk_free_rate, t), survival_prob.shape)
+    mask = np.broadcast_to(mask, survival_prob.shape)
+    face, coupon, recovery = (np.full(n_scenarios, float(x)) for x in
+                              (face_value, face_value * coupon_rate / frequency, recovery_rate))
+    return assemble_legs(*survival_legs(face, coupon, recovery, survival_prob, survival_prev, discount, mask,
+                                        survival_prob[:, periods[0] - 1], discount_factor(risk_free_rate, years)), legs)
+
+
+# --- Main Execution ---
+
+def main():
+    # The toy table from PCAIllustration: StandardScaler + PCA via the streaming statistics
+    toy = pd.DataFrame({"Year 1": [5, 3, 4], "Year 2": [6, 4, 5], "Year 3": [4, 2, 3]}, index=["Ali", "Sara", "Omar"])
+    pca = StreamingPCA(3, n_components=2, standardize=True).update(toy.values)
+    print("\n📊 Principal Components (PCAIllustration data)\n")
+    print(pd.DataFrame(pca.project(toy.values), index=toy.index,
+                       columns=["Principal Component 1", "Principal Component 2"]).round(6).add(0.0).to_string())
+    print(f"\nPC1: {pca.explained_variance_ratio[0]:.2f}, PC2: {pca.explained_variance_ratio[1]:.2f}")
+
+    # Synthetic history: daily spread-curve changes for 1,000 issuers driven by market-wide and
+    # issuer-specific level / slope / curvature moves
+    rng = np.random.default_rng(0)
+    tenors = np.array([0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+    x = np.log1p(tenors) / np.log1p(30)
+    loadings = np.vstack([np.ones_like(x), x - x.mean(), (x - x.mean()) ** 2 - ((x - x.mean()) ** 2).mean()])
+    n_days, n_issuers = 500, 1_000
+    daily = StreamingPCA(len(tenors), n_components=3)
+    history = np.empty((n_days, n_issuers * len(tenors)))
+    start = time.perf_counter()
+    for day in range(n_days):
+        market = rng.normal(0, [0.0006, 0.0003, 0.00015])
+        factors = market + rng.normal(0, [0.0004, 0.0002, 0.0001], size=(n_issuers, 3))
+        changes = factors @ loadings + rng.normal(0, 0.00005, size=(n_issuers, len(tenors)))
+        daily.update(changes)
+        history[day] = changes.ravel()
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 Streaming PCA of Daily Curve Changes ({n_days} days x {n_issuers:,} issuers, {elapsed:.2f}s)\n")
+    print(pd.DataFrame(daily.components, index=['Level', 'Slope', 'Curvature'],
+                       columns=[f'{t:g}Y' for t in tenors]).round(3).to_string())
+    print(f"\nExplained variance ratio: {np.round(daily.explained_variance_ratio, 4)}")
+
+    # Wide matrix (days x issuer-tenor pairs): randomized SVD against the exact SVD
+    start = time.perf_counter()
+    _, _, variance = randomized_pca(history, n_components=5, rng=1)
+    randomized_time = time.perf_counter() - start
+    start = time.perf_counter()
+    exact = np.linalg.svd(history - history.mean(axis=0), compute_uv=False)[:5] ** 2 / (n_days - 1)
+    exact_time = time.perf_counter() - start
+    print(f"\n📊 Randomized vs Exact SVD ({history.shape[0]} x {history.shape[1]:,})\n")
+    print(pd.DataFrame({'Randomized': variance, 'Exact': exact}).to_string(index=False))
+    print(f"\nRandomized {randomized_time:.2f}s vs exact {exact_time:.2f}s")
+
+    # 10-day PCA shocks on a base curve, priced straight through the survival model
+    base = 0.01 + 0.01 * x
+    scenarios = np.maximum(base + daily.shocks(10_000, rng=2, horizon=10), 0.0)
+    prices = price_spread_scenarios(100, 0.05, 5, 0.03, tenors, scenarios, 0.4)
+    base_price = price_spread_scenarios(100, 0.05, 5, 0.03, tenors, base, 0.4)[0]
+    print(f"\n📊 10-Day PCA Spread Scenarios (5Y bond, base price {base_price:.4f})\n")
+    print(pd.Series(prices - base_price, name='PnL').describe(percentiles=[0.01, 0.05, 0.5, 0.95, 0.99])
+          .to_frame().T.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
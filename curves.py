@@ -0,0 +1,116 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+# --- Term Structures ---
+
+class TermStructure:
+    """
+    Rate term structure with precomputed cumulative integrals.
+
+    'piecewise_constant': rates[k] is the instantaneous (forward or hazard) rate on (times[k-1], times[k]].
+    'linear': rates[k] is the zero rate at times[k], linearly interpolated in between.
+    Both extrapolate flat beyond the last pillar. A lookup at any vector of times costs one
+    np.searchsorted (O(log n) per time), and recently requested grids are memoized up to cache_size
+    grids and cache_bytes in total; a grid larger than the byte budget is never memoized.
+    """
+
+    def __init__(self, times, rates, interpolation='piecewise_constant', cache_size=64, cache_bytes=64 * 2 ** 20):
+        self.times = np.asarray(times, dtype=float)
+        self.rates = np.asarray(rates, dtype=float)
+        if self.times.ndim != 1 or self.times.shape != self.rates.shape or len(self.times) == 0:
+            raise ValueError("times and rates must be non-empty 1-D arrays of the same length.")
+        if np.any(np.diff(self.times) <= 0) or self.times[0] <= 0:
+            raise ValueError("Pillar times must be positive and strictly increasing.")
+        if interpolation not in ('piecewise_constant', 'linear'):
+            raise ValueError("Unsupported interpolation.")
+        self.interpolation = interpolation
+        widths = np.diff(self.times, prepend=0.0)
+        self._starts = self.times - widths
+        self._cumulative = np.concatenate([[0.0], np.cumsum(self.rates * widths)])
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_bytes = cache_bytes
+        self._bytes = 0
+
+    @classmethod
+    def flat(cls, rate):
+        return cls([1.0], [rate])
+
+    def integral(self, t):
+        """Integrated rate from 0 to t."""
+        t = np.asarray(t, dtype=float)
+        if self.interpolation == 'linear':
+            return np.interp(t, self.times, self.rates) * t
+        k = np.minimum(np.searchsorted(self.times, t, side='left'), len(self.times) - 1)
+        return self._cumulative[k] + self.rates[k] * (t - self._starts[k])
+
+    def rate(self, t):
+        """Instantaneous rate at t, left-continuous at the pillars like the segments (times[k-1], times[k]]."""
+        t = np.asarray(t, dtype=float)
+        if self.interpolation == 'linear':
+            # d/dt [z(t) * t] = z(t) + t * z'(t), with z' the slope of the current segment
+            z = np.interp(t, self.times, self.rates)
+            if len(self.times) == 1:
+                return z
+            slopes = np.diff(self.rates) / np.diff(self.times)
+            k = np.clip(np.searchsorted(self.times, t, side='left'), 1, len(self.times) - 1)
+            inside = (t > self.times[0]) & (t <= self.times[-1])
+            return z + np.where(inside, slopes[k - 1], 0.0) * t
+        k = np.minimum(np.searchsorted(self.times, t, side='left'), len(self.times) - 1)
+        return self.rates[k]
+
+    def factor(self, t):
+        """exp(-integral(t)), memoized on the exact grid requested."""
+        t = np.asarray(t, dtype=float)
+        if t.ndim == 0:
+            return np.exp(-self.integral(t))
+        key = (t.shape, t.tobytes())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        value = np.exp(-self.integral(t))
+        value.flags.writeable = False
+        if value.nbytes > self._cache_bytes:
+            return value
+        self._cache[key] = value
+        self._bytes += value.nbytes
+        while len(self._cache) > self._cache_size or self._bytes > self._cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        return value
+
+
+class DiscountCurve(TermStructure):
+    """Risk-free curve of continuously-compounded forward (or zero) rates."""
+
+    def discount(self, t):
+        return self.factor(t)
+
+
+class HazardCurve(TermStructure):
+    """Default intensity curve; survival(t) = exp(-integral of the hazard rate from 0 to t)."""
+
+    def survival(self, t):
+        return self.factor(t)
+
+    def default_probability(self, t1, t0):
+        return self.survival(t0) - self.survival(t1)
+
+
+# --- Scalar-or-Curve Helpers ---
+
+def discount_factor(rate_or_curve, t):
+    """Discount factor from either a flat continuously-compounded rate or a DiscountCurve."""
+    if isinstance(rate_or_curve, TermStructure):
+        return rate_or_curve.factor(t)
+    return np.exp(-rate_or_curve * t)
+
+
+def survival_probability(hazard_or_curve, t):
+    """Survival probability from either a flat hazard rate or a HazardCurve."""
+    if isinstance(hazard_or_curve, TermStructure):
+        return hazard_or_curve.factor(t)
+    return np.exp(-hazard_or_curve * t)
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+# --- Convention Codes ---
+
+ANNUAL, SEMI_ANNUAL, CONTINUOUS, SIMPLE, ACT_360 = range(5)
+
+CONVENTION_CODES = {
+    'annual': ANNUAL,
+    'semi-annual': SEMI_ANNUAL,
+    'continuous': CONTINUOUS,
+    'simple': SIMPLE,
+    'act/360': ACT_360,
+}
+
+
+def convention_codes(convention):
+    """
+    Map convention names to integer codes, comparing each distinct string once rather than once per row.
+
+    Integer input is validated and passed through.
+    """
+    convention = np.asarray(convention)
+    if np.issubdtype(convention.dtype, np.integer):
+        if np.any((convention < ANNUAL) | (convention > ACT_360)):
+            raise ValueError("Unsupported compounding convention.")
+        return convention
+    names, inverse = np.unique(convention.astype(str), return_inverse=True)
+    unknown = [name for name in names if name.lower() not in CONVENTION_CODES]
+    if unknown:
+        raise ValueError(f"Unsupported compounding convention: {unknown}.")
+    codes = np.array([CONVENTION_CODES[name.lower()] for name in names])
+    return codes[inverse].reshape(convention.shape)
+
+
+# --- Discounting Kernel ---
+
+def _discount(code, rate, t):
+    if code == ANNUAL:
+        return 1 / (1 + rate) ** t
+    if code == SEMI_ANNUAL:
+        return 1 / (1 + rate / 2) ** (2 * t)
+    if code == CONTINUOUS:
+        return np.exp(-rate * t)
+    if code == SIMPLE:
+        return 1 / (1 + rate * t)
+    # money-market simple interest on actual days (t in years of 365) over a 360-day year
+    return 1 / (1 + rate * t * 365 / 360)
+
+
+def discount_factors(rate, t, convention):
+    """
+    Discount factors for N rows, each with its own compounding convention.
+
+    Rows are grouped by convention code and every group is evaluated with a single NumPy expression,
+    so the cost is one pass per convention present rather than a string comparison per row.
+
+    Args:
+        rate (array-like): Annualized rate per row, shape (N,).
+        t (array-like): Times to payment in years, shape (N,) or (N, M).
+        convention (array-like): Convention name or code per row, shape (N,).
+
+    Returns:
+        np.ndarray: Discount factors with the shape of t.
+    """
+    t = np.asarray(t, dtype=float)
+    codes = np.broadcast_to(convention_codes(convention), t.shape[:1])
+    rate = np.broadcast_to(np.asarray(rate, dtype=float), t.shape[:1])
+    if t.ndim == 2:
+        rate = rate[:, None]
+    out = np.empty_like(t)
+    present = np.bincount(codes, minlength=ACT_360 + 1)
+    for code in np.flatnonzero(present):
+        if present[code] == len(codes):
+            return _discount(code, rate, t)
+        rows = np.flatnonzero(codes == code)
+        out[rows] = _discount(code, rate[rows], t[rows])
+    return out
+
+
+def _log_growth(code, rate):
+    """Continuously-compounded equivalent of a compounding rate, so DF(t) = exp(-growth * t)."""
+    if code == ANNUAL:
+        return np.log1p(rate)
+    if code == SEMI_ANNUAL:
+        return 2 * np.log1p(rate / 2)
+    return rate
+
+
+def annuity_factors(rate, ttm, frequency, n_payments, convention):
+    """
+    Sum of discount factors over the payment times ttm, ttm - 1/f, ..., ttm - (n - 1)/f for N rows.
+
+    For the compounding conventions the factors form a geometric series and are summed in closed form;
+    the simple-interest rows are summed on a padded grid that only spans those rows.
+
+    Args:
+        rate, ttm, frequency (array-like): Per-row rate, time of the last payment and payments per year.
+        n_payments (array-like): Number of remaining payments per row.
+        convention (array-like): Convention name or code per row.
+
+    Returns:
+        np.ndarray: Annuity factor per row.
+    """
+    rate, ttm, frequency = (np.asarray(x, dtype=float) for x in (rate, ttm, frequency))
+    n_payments = np.asarray(n_payments)
+    codes = convention_codes(convention)
+    out = np.zeros(len(codes))
+    for code in np.unique(codes):
+        rows = np.flatnonzero(codes == code)
+        r, T, f, n = rate[rows], ttm[rows], frequency[rows], n_payments[rows]
+        if code in (ANNUAL, SEMI_ANNUAL, CONTINUOUS):
+            step = _log_growth(code, r) / f
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = np.where(step != 0, np.expm1(n * step) / np.expm1(step), n)
+            out[rows] = np.exp(-_log_growth(code, r) * T) * ratio
+        else:
+            steps = np.arange(n.max(initial=0))
+            live = steps < n[:, None]
+            t = np.where(live, T[:, None] - steps / f[:, None], 0.0)
+            out[rows] = np.where(live, _discount(code, r[:, None], t), 0.0).sum(axis=1)
+    return out
+
+
+def valuation_zero_coupon_bond(notional, rate, ttm, convention='annual'):
+    """
+    Valuation of zero-coupon bonds, scalar or vectorized.
+
+    Args:
+        notional (float or array-like): Face value of the bond(s).
+        rate (float or array-like): Annualized interest rate(s).
+        ttm (float or array-like): Time to maturity in years.
+        convention (str, int or array-like): 'annual', 'semi-annual', 'continuous', 'simple' or 'act/360',
+            or the matching codes; one per row for arrays.
+
+    Returns:
+        float or np.ndarray: Present value of the zero-coupon bond(s).
+    """
+    scalar = np.ndim(notional) == np.ndim(rate) == np.ndim(ttm) == np.ndim(convention) == 0
+    notional, rate, ttm, convention = np.broadcast_arrays(notional, rate, ttm, convention)
+    value = np.atleast_1d(notional) * discount_factors(np.atleast_1d(rate), np.atleast_1d(ttm),
+                                                        np.atleast_1d(convention))
+    return float(value[0]) if scalar else value
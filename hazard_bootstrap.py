@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from curves import HazardCurve, discount_factor
+from survival_batch import survival_legs
+
+
+# --- Market Quotes to Target Prices ---
+
+def spread_to_price(maturity, spread, coupon_rate, risk_free_rate, face_value=100, frequency=2):
+    """
+    Price of a bullet bond discounted at the risk-free curve plus a flat continuously-compounded spread.
+
+    Args:
+        maturity (float): Bond maturity in years.
+        spread (np.ndarray): Spread per issuer.
+        coupon_rate (np.ndarray): Annual coupon rate per issuer.
+        risk_free_rate (float or DiscountCurve): Risk-free rate or curve.
+
+    Returns:
+        np.ndarray: Target price per issuer.
+    """
+    t = np.arange(1, int(maturity * frequency) + 1) / frequency
+    spread = np.asarray(spread, dtype=float)[:, None]
+    discount = discount_factor(risk_free_rate, t) * np.exp(-spread * t)
+    coupon = face_value * np.asarray(coupon_rate, dtype=float) / frequency
+    final = discount_factor(risk_free_rate, maturity) * np.exp(-spread[:, 0] * maturity)
+    return coupon * discount.sum(axis=1) + face_value * final
+
+
+# --- Vectorized Bootstrap ---
+
+def bootstrap_hazard_curves(maturities, prices=None, spreads=None, coupon_rate=0.05, risk_free_rate=0.03,
+                            recovery_rate=0.4, face_value=100, frequency=2, tol=1e-10, max_iter=50,
+                            max_hazard=10.0):
+    """
+    Fit piecewise-constant hazard rates for many issuers from a term structure of bond prices or spreads.
+
+    Pillars are solved in order of maturity. At each pillar every Newton iteration updates the
+    unknown segment hazard of every issuer at once, using the survival-based NPV kernel for the
+    price and the same kernel on d(survival)/dh for the slope.
+
+    Args:
+        maturities (array-like): Pillar maturities in years, shared by all issuers.
+        prices (array-like): Market prices, shape (n_issuers, n_pillars).
+        spreads (array-like): Spreads over the risk-free curve, used when prices is None.
+        coupon_rate (float or array-like): Coupon per issuer, or per (issuer, pillar).
+        risk_free_rate (float or DiscountCurve): Risk-free rate or curve.
+        recovery_rate (float or array-like): Recovery per issuer.
+
+    Returns:
+        tuple: (hazards, residuals, report) with hazards and price residuals of shape
+        (n_issuers, n_pillars) and a one-row DataFrame of calibration statistics.
+    """
+    start = time.perf_counter()
+    maturities = np.asarray(maturities, dtype=float)
+    quotes = np.atleast_2d(prices if prices is not None else spreads).astype(float)
+    n_issuers, n_pillars = quotes.shape
+    coupon_rate = np.asarray(coupon_rate, dtype=float)
+    if coupon_rate.ndim == 1:
+        coupon_rate = coupon_rate[:, None]
+    coupon_rate = np.broadcast_to(coupon_rate, quotes.shape)
+    recovery_rate = np.broadcast_to(np.asarray(recovery_rate, dtype=float), (n_issuers,))
+    face_value = np.broadcast_to(np.asarray(face_value, dtype=float), (n_issuers,))
+    if prices is None:
+        quotes = np.column_stack([
+            spread_to_price(maturities[k], quotes[:, k], coupon_rate[:, k], risk_free_rate, face_value, frequency)
+            for k in range(n_pillars)])
+
+    hazards = np.zeros((n_issuers, n_pillars))
+    residuals = np.zeros((n_issuers, n_pillars))
+    iterations = 0
+    pillar_starts = np.concatenate([[0.0], maturities[:-1]])
+    for k in range(n_pillars):
+        periods = int(maturities[k] * frequency)
+        t = np.arange(1, periods + 1) / frequency
+        grid = np.concatenate([t - 1 / frequency, [periods / frequency]])
+
+        # integrated hazard from the already-solved segments, plus the exposure to the unknown one
+        known = np.clip(grid[None, :] - pillar_starts[:k, None], 0.0,
+                        (maturities[:k] - pillar_starts[:k])[:, None])
+        base = hazards[:, :k] @ known
+        weight = np.clip(grid - pillar_starts[k], 0.0, None)
+
+        discount = np.broadcast_to(discount_factor(risk_free_rate, t), (n_issuers, periods))
+        final_discount = np.broadcast_to(discount_factor(risk_free_rate, maturities[k]), (n_issuers,))
+        mask = np.ones((n_issuers, periods), dtype=bool)
+        coupon = face_value * coupon_rate[:, k] / frequency
+
+        h = np.full(n_issuers, 0.02)
+        for _ in range(max_iter):
+            iterations += 1
+            survival = np.exp(-base - h[:, None] * weight)
+            d_survival = -weight * survival
+            price = sum(survival_legs(face_value, coupon, recovery_rate, survival[:, 1:], survival[:, :-1],
+                                      discount, mask, survival[:, -1], final_discount))
+            slope = sum(survival_legs(face_value, coupon, recovery_rate, d_survival[:, 1:], d_survival[:, :-1],
+                                      discount, mask, d_survival[:, -1], final_discount))
+            residual = price - quotes[:, k]
+            if np.all(np.abs(residual) < tol):
+                break
+            with np.errstate(divide='ignore', invalid='ignore'):
+                h = np.clip(np.where(slope != 0, h - residual / slope, h), 0.0, max_hazard)
+        hazards[:, k] = h
+        residuals[:, k] = residual
+
+    elapsed = time.perf_counter() - start
+    report = pd.DataFrame([{
+        'Issuers': n_issuers,
+        'Pillars': n_pillars,
+        'Newton Iterations': iterations,
+        'Calibration Time (s)': elapsed,
+        'Issuers / s': n_issuers / elapsed,
+        'Max |Residual|': np.abs(residuals).max(),
+    }])
+    return hazards, residuals, report
+
+
+def to_hazard_curves(maturities, hazards):
+    """Wrap each issuer's bootstrapped hazards as a HazardCurve for the survival pricers."""
+    return [HazardCurve(maturities, row) for row in np.atleast_2d(hazards)]
+
+
+# --- Main Execution ---
+
+def main():
+    rng = np.random.default_rng(7)
+    maturities = np.array([1, 2, 3, 5, 7, 10])
+    n_issuers = 5000
+    spreads = np.sort(rng.uniform(0.002, 0.08, size=(n_issuers, len(maturities))), axis=1)
+
+    hazards, residuals, report = bootstrap_hazard_curves(maturities, spreads=spreads, coupon_rate=0.05,
+                                                         risk_free_rate=0.03, recovery_rate=0.4)
+
+    print("\n📊 Hazard Bootstrap Report\n")
+    print(report.to_string(index=False))
+
+    print("\n🔍 First Issuers (Bootstrapped Hazard Rates)\n")
+    print(pd.DataFrame(hazards[:5], columns=[f"{m}Y" for m in maturities]).to_string())
+
+
+if __name__ == "__main__":
+    main()
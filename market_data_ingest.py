@@ -0,0 +1,261 @@
+import asyncio
+import io
+import os
+import random
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from market_data_store import MarketDataStore
+
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+RETRYABLE_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+if HAS_AIOHTTP:
+    import aiohttp
+
+    RETRYABLE_ERRORS += (aiohttp.ClientError,)
+
+
+# --- Sources ---
+
+class FileSource:
+    """Local CSV files, one per symbol ('date,price' with a header row)."""
+
+    def __init__(self, root, pattern='{symbol}.csv'):
+        self.root = root
+        self.pattern = pattern
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def _read(self, symbol):
+        with open(os.path.join(self.root, self.pattern.format(symbol=symbol))) as f:
+            return f.read()
+
+    async def fetch(self, symbol):
+        return await asyncio.to_thread(self._read, symbol)
+
+
+class HttpSource:
+    """
+    HTTP source with a pooled session: aiohttp with a connection limit when installed, otherwise
+    urllib calls in worker threads capped by a semaphore.
+    """
+
+    def __init__(self, url_template, max_connections=16, timeout=10.0, headers=None):
+        self.url_template = url_template
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.headers = headers or {'User-Agent': 'Mozilla/5.0'}
+        self._session = None
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def __aenter__(self):
+        if HAS_AIOHTTP:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout), headers=self.headers)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._session is not None:
+            await self._session.close()
+        return False
+
+    def _get(self, url):
+        request = urllib.request.Request(url, headers=self.headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read().decode()
+
+    async def fetch(self, symbol):
+        url = self.url_template.format(symbol=symbol)
+        if self._session is not None:
+            async with self._session.get(url) as response:
+                response.raise_for_status()
+                return await response.text()
+        async with self._slots:
+            return await asyncio.to_thread(self._get, url)
+
+
+class StubSource:
+    """
+    Synthetic stand-in for investing.com: random-walk price histories served with a simulated
+    latency and a rate of transient failures, for tests and benchmarks without the network.
+    """
+
+    def __init__(self, n_days=2_500, latency=0.01, failure_rate=0.0, seed=0, start='2015-01-01'):
+        self.n_days = n_days
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.dates = np.arange(np.datetime64(start), np.datetime64(start) + n_days, dtype='datetime64[D]')
+        self._random = random.Random(seed)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def fetch(self, symbol):
+        await asyncio.sleep(self.latency)
+        if self._random.random() < self.failure_rate:
+            raise ConnectionError(f"Transient failure fetching {symbol}.")
+        rng = np.random.default_rng([self.seed, sum(map(ord, symbol))])
+        prices = 100 + np.cumsum(rng.normal(0, 0.5, size=self.n_days))
+        body = '\n'.join(f'{d},{p:.4f}' for d, p in zip(self.dates.astype(str), prices))
+        return 'date,price\n' + body
+
+
+# --- Parsing ---
+
+def parse_records(text):
+    """Columnar parse of a 'date,price' page into (datetime64[D] dates, float64 prices); bad rows are dropped."""
+    frame = pd.read_csv(io.StringIO(text), usecols=[0, 1], dtype=str)
+    dates = pd.to_datetime(frame.iloc[:, 0], errors='coerce').values.astype('datetime64[D]')
+    prices = pd.to_numeric(frame.iloc[:, 1].str.replace(',', ''), errors='coerce').to_numpy(dtype=float)
+    valid = ~np.isnat(dates) & ~np.isnan(prices)
+    return dates[valid], prices[valid]
+
+
+# --- Pipeline ---
+
+def _is_retryable(error):
+    """
+    Only transient failures are retried: dropped connections, timeouts, aiohttp client errors and HTTP
+    408 / 429 / 5xx. Missing files, refused permissions, other HTTP statuses and malformed pages fail at once.
+    """
+    status = getattr(error, 'status', None) or getattr(error, 'code', None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS
+    if isinstance(error, urllib.error.URLError):
+        return isinstance(error.reason, RETRYABLE_ERRORS)
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+async def _fetch_with_retry(source, symbol, retries, backoff, stats):
+    for attempt in range(retries + 1):
+        try:
+            text = await source.fetch(symbol)
+            return await asyncio.to_thread(parse_records, text)
+        except Exception as error:
+            if attempt == retries or not _is_retryable(error):
+                raise
+            stats['retries'] += 1
+            await asyncio.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+
+async def ingest(symbols, source, store, concurrency=16, queue_size=64, batch_size=50, retries=3, backoff=0.05):
+    """
+    Fetch many symbols concurrently and bulk-write them into a MarketDataStore.
+
+    concurrency fetch workers pull symbols and push parsed columns into a bounded queue; a single
+    writer drains it and writes batch_size symbols at a time in a worker thread. When the writer falls
+    behind, the full queue blocks the fetchers (backpressure). Transient fetch failures are retried with
+    exponential backoff and jitter; symbols that still fail are reported, not raised. A failing write
+    is raised: the fetchers are cancelled rather than left blocked on the full queue.
+
+    Returns:
+        pd.DataFrame: One-row report with symbols, records, failures, retries, elapsed time and records / s.
+    """
+    todo = asyncio.Queue()
+    for symbol in symbols:
+        todo.put_nowait(symbol)
+    parsed = asyncio.Queue(maxsize=queue_size)
+    stats = {'records': 0, 'retries': 0, 'failed': []}
+    start = time.perf_counter()
+
+    async def fetcher():
+        while True:
+            try:
+                symbol = todo.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                dates, prices = await _fetch_with_retry(source, symbol, retries, backoff, stats)
+            except Exception as error:
+                stats['failed'].append((symbol, repr(error)))
+                continue
+            await parsed.put((symbol, dates, prices))
+
+    def write_batch(batch):
+        for symbol, dates, prices in batch:
+            store.write(symbol, dates, prices)
+        return sum(len(dates) for _, dates, _ in batch)
+
+    async def writer():
+        batch = []
+        while True:
+            item = await parsed.get()
+            if item is not None:
+                batch.append(item)
+            if batch and (item is None or len(batch) >= batch_size):
+                stats['records'] += await asyncio.to_thread(write_batch, batch)
+                batch = []
+            if item is None:
+                return
+
+    async with source:
+        writer_task = asyncio.create_task(writer())
+        fetching = asyncio.gather(*(fetcher() for _ in range(concurrency)))
+        # the writer only finishes before the fetchers when a write failed
+        done, pending = await asyncio.wait({writer_task, fetching}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                for other in pending:
+                    other.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise task.exception()
+        await parsed.put(None)
+        await writer_task
+
+    elapsed = time.perf_counter() - start
+    return pd.DataFrame([{
+        'Symbols': len(symbols) - len(stats['failed']),
+        'Records': stats['records'],
+        'Failed': len(stats['failed']),
+        'Retries': stats['retries'],
+        'Elapsed (s)': elapsed,
+        'Records / s': stats['records'] / elapsed if elapsed > 0 else np.nan,
+    }])
+
+
+def run_ingest(symbols, source, store, **kwargs):
+    """Synchronous entry point for ingest()."""
+    return asyncio.run(ingest(symbols, source, store, **kwargs))
+
+
+# --- Main Execution ---
+
+def main():
+    symbols = [f'BOND-{i:04d}' for i in range(500)]
+
+    store = MarketDataStore()
+    report = run_ingest(symbols, StubSource(n_days=2_500, latency=0.02, failure_rate=0.05, seed=1), store,
+                        concurrency=32)
+    print("\n📊 Stub Source Ingestion (500 symbols, 20 ms latency, 5% transient failures)\n")
+    print(report.to_string(index=False))
+
+    # Local files standing in for the investing.com pages
+    file_store = MarketDataStore()
+    with tempfile.TemporaryDirectory(prefix='market_pages_') as root:
+        for symbol in symbols[:20]:
+            dates, prices = store.historical_data(symbol)
+            pd.DataFrame({'date': dates, 'price': prices}).to_csv(os.path.join(root, f'{symbol}.csv'), index=False)
+        report = run_ingest(symbols[:20], FileSource(root), file_store, concurrency=8)
+    print("\n📊 File Source Ingestion\n")
+    print(report.to_string(index=False))
+    print(f"\nRound trip identical: {all(np.array_equal(store.historical_data(s)[1], file_store.historical_data(s)[1]) for s in symbols[:20])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+from collections import OrderedDict
+
+import numpy as np
+from scipy.special import ndtri
+
+
+# --- Quasi-Random Brownian Increments ---
+
+def _bridge_plan(n_steps):
+    """Brownian-bridge construction order: terminal point first, then midpoints breadth-first."""
+    plan = [(n_steps, 0, None)]
+    intervals = [(0, n_steps)]
+    while intervals:
+        left, right = intervals.pop(0)
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        plan.append((mid, left, right))
+        intervals += [(left, mid), (mid, right)]
+    return plan
+
+
+def brownian_bridge(normals, dt):
+    """
+    Brownian increments from standard normals via the Brownian bridge.
+
+    Column 0 fixes W(T) and each following column fills the midpoint of an interval whose ends are
+    already known, so the first (best-distributed) Sobol dimensions carry most of the path variance.
+
+    Args:
+        normals (np.ndarray): Standard normals of shape (n_paths, n_steps).
+        dt (float): Step length.
+
+    Returns:
+        np.ndarray: Increments dW of shape (n_paths, n_steps).
+    """
+    n_paths, n_steps = normals.shape
+    W = np.zeros((n_paths, n_steps + 1))
+    for column, (point, left, right) in enumerate(_bridge_plan(n_steps)):
+        if right is None:
+            W[:, point] = np.sqrt(point * dt) * normals[:, column]
+            continue
+        weight = (point - left) / (right - left)
+        sd = np.sqrt((point - left) * (right - point) / (right - left) * dt)
+        W[:, point] = (1 - weight) * W[:, left] + weight * W[:, right] + sd * normals[:, column]
+    return np.diff(W, axis=1)
+
+
+def sobol_normals(n_paths, n_steps, rng=None):
+    """Scrambled Sobol points mapped to standard normals, shape (n_paths, n_steps); n_paths should be a power of two."""
+    from scipy.stats import qmc  # deferred: scipy.stats is slow to import and only the Sobol sampler needs it
+    points = qmc.Sobol(d=n_steps, scramble=True, seed=np.random.default_rng(rng)).random(n_paths)
+    return ndtri(np.clip(points, 1e-16, 1 - 1e-16))
+
+
+# --- Short-Rate Path Simulation ---
+
+def simulate_short_rates(r0, sigma, years, frequency=2, n_paths=200, rng=None, antithetic=False, sampler='pseudo'):
+    """
+    Simulate the driftless lognormal short rate used by oas_model for a whole path matrix at once.
+
+    Args:
+        r0 (float): Initial short rate.
+        sigma (float): Lognormal volatility.
+        years (float): Simulation horizon in years.
+        frequency (int): Time steps per year.
+        n_paths (int): Number of paths (rounded up to even when antithetic; for 'sobol' the number of Sobol
+            points, n_paths or half of it when antithetic, is rounded up to a power of two to keep the
+            sequence's balance properties).
+        rng (np.random.Generator or int or None): Generator or seed for reproducible paths (or scrambling).
+        antithetic (bool): Pair every Brownian increment with its negative.
+        sampler (str): 'pseudo' for pseudo-random normals, 'sobol' for scrambled Sobol points with
+            Brownian-bridge path construction.
+
+    Returns:
+        np.ndarray: Rate matrix of shape (n_paths, n_steps + 1) with rates[:, 0] = r0.
+    """
+    if sampler not in ('pseudo', 'sobol'):
+        raise ValueError("sampler must be 'pseudo' or 'sobol'.")
+    rng = np.random.default_rng(rng)
+    dt = 1 / frequency
+    n_steps = int(years * frequency)
+    if n_paths < 1:
+        raise ValueError("n_paths must be positive.")
+    n_draws = (n_paths + 1) // 2 if antithetic else n_paths
+    if sampler == 'sobol':
+        n_draws = 1 << (n_draws - 1).bit_length()
+        dW = brownian_bridge(sobol_normals(n_draws, n_steps, rng), dt)
+    else:
+        dW = rng.normal(0, np.sqrt(dt), size=(n_draws, n_steps))
+    if antithetic:
+        dW = np.concatenate([dW, -dW])
+    log_steps = np.cumsum(-0.5 * sigma ** 2 * dt + sigma * dW, axis=1)
+    rates = np.empty((dW.shape[0], n_steps + 1))
+    rates[:, 0] = r0
+    rates[:, 1:] = r0 * np.exp(log_steps)
+    return rates
+
+
+# --- Exercise-Adjusted Path Cash Flows ---
+
+def path_discount_factors(rates, frequency=2):
+    """
+    Pathwise discount factors from one cumulative sum over the rate matrix.
+
+    The factor for step i uses the rates observed at steps 0..i-1, exactly as oas_model does
+    with np.sum(path[:i]), but in O(paths x steps) instead of O(paths x steps^2).
+    """
+    dt = 1 / frequency
+    return np.exp(-np.cumsum(rates[:, :-1], axis=1) * dt)
+
+
+def discounted_path_cashflows(rates, face_value, coupon_rate, call_price, call_year, frequency=2):
+    """
+    Apply the call rule to every path with masks and discount the surviving cash flows at zero spread.
+
+    A path is called on its first step with t >= call_year where the call is in the money
+    (df * call_price < call_price); the call price replaces that step's coupon and nothing is paid
+    afterwards. The exercise test uses the rate-path discount factor only, so the exercise
+    decision does not depend on the OAS and the same matrix can be repriced at any spread.
+
+    Returns:
+        tuple: (pv_flows, t) where pv_flows has shape (n_paths, n_steps) and t holds the step times.
+    """
+    dt = 1 / frequency
+    n_paths, n_steps = rates.shape[0], rates.shape[1] - 1
+    t = np.arange(1, n_steps + 1) * dt
+    df = path_discount_factors(rates, frequency)
+
+    cash_flow = np.full(n_steps, face_value * coupon_rate / frequency)
+    cash_flow[-1] += face_value
+    flows = np.broadcast_to(cash_flow, (n_paths, n_steps)).copy()
+
+    if call_year:
+        exercisable = (t >= call_year) & (df * call_price < call_price)
+        called = exercisable.any(axis=1)
+        call_step = np.argmax(exercisable, axis=1)
+        steps = np.arange(n_steps)
+        flows[called[:, None] & (steps > call_step[:, None])] = 0.0
+        flows[called, call_step[called]] = call_price
+
+    return flows * df, t
+
+
+def discounted_schedule_cashflows(rates, schedule, row):
+    """
+    discounted_path_cashflows for one row of a CashflowSchedule (sinkers, step-ups, amortizers, ...).
+
+    The schedule's payment dates must sit on the simulation steps (same frequency). Call dates use
+    the same in-the-money rule as oas_model, with the call price per 100 of outstanding notional.
+    Put dates are not exercised: the path-wise rule has no continuation value to compare against.
+
+    Returns:
+        tuple: (pv_flows, t) with pv_flows of shape (n_paths, n_periods).
+    """
+    live = schedule.mask[row]
+    n_steps = int(live.sum())
+    t = schedule.times[row, :n_steps]
+    df = path_discount_factors(rates[:, :n_steps + 1], schedule.frequency[row])
+    flows = np.broadcast_to(schedule.cash_flow[row, :n_steps], df.shape).copy()
+
+    call_amount = schedule.call_price[row, :n_steps] / 100 * schedule.outstanding[row, :n_steps]
+    exercisable = ~np.isnan(call_amount) & (df * call_amount < call_amount)
+    called = exercisable.any(axis=1)
+    call_step = np.argmax(exercisable, axis=1)
+    steps = np.arange(n_steps)
+    flows[called[:, None] & (steps > call_step[:, None])] = 0.0
+    flows[called, call_step[called]] = call_amount[call_step[called]]
+    return flows * df, t
+
+
+def simulate_path_blocks(r0, sigma, years, frequency=2, n_paths=10000, rng=None, antithetic=False, sampler='pseudo',
+                         n_replications=1):
+    """
+    The path matrix oas_model_batch prices off: n_replications independently randomized, equal blocks of
+    ceil(n_paths / n_replications) paths (rounded up as simulate_short_rates does) stacked row-wise; one
+    block is simulated straight from rng. n_paths is therefore a minimum, never silently truncated.
+    """
+    if n_replications < 1 or n_paths < n_replications:
+        raise ValueError("n_paths must be at least n_replications (and n_replications at least 1).")
+    if n_replications == 1:
+        return simulate_short_rates(r0, sigma, years, frequency, n_paths, rng, antithetic, sampler)
+    block = -(-n_paths // n_replications)
+    return np.concatenate([simulate_short_rates(r0, sigma, years, frequency, block, stream, antithetic, sampler)
+                           for stream in np.random.default_rng(rng).spawn(n_replications)])
+
+
+def _check_supplied_rates(rates, n_steps, control_variate, **settings):
+    """Refuse pre-simulated paths that are too short, do not split into the blocks or were simulated differently."""
+    if rates.ndim != 2 or rates.shape[1] < n_steps + 1:
+        raise ValueError(f"Paths cover {rates.shape[-1] - 1} steps; the bond needs {n_steps}.")
+    if rates.shape[0] % settings['n_replications']:
+        raise ValueError(f"{rates.shape[0]} paths do not split into {settings['n_replications']} equal blocks.")
+    scenario = getattr(rates, 'scenario', None)
+    if scenario is None:
+        if control_variate:
+            raise ValueError("control_variate needs the paths' r0 and sigma: pass paths from a PathStore, "
+                             "or let oas_model_batch simulate them.")
+        return
+    mismatched = []
+    for name, value in settings.items():
+        stored = scenario[name]
+        if stored != value if isinstance(value, str) else not np.isclose(float(stored), float(value)):
+            mismatched.append(f"{name}={stored!r} (requested {value!r})")
+    if mismatched:
+        raise ValueError("Paths were simulated with different settings: " + ", ".join(mismatched))
+
+
+# --- Control Variate: Non-Callable Bond ---
+
+_zero_price_cache = OrderedDict()
+ZERO_PRICE_CACHE_SIZE = 64
+ZERO_PRICE_PATHS = 2 ** 17
+
+
+def model_zero_prices(r0, sigma, years, frequency=2, n_paths=ZERO_PRICE_PATHS, seed=0):
+    """
+    Model zero-coupon prices E[D_k] on the simulation steps, to high precision and memoized.
+
+    The non-callable bond's expected value under the short-rate model is sum_k cf_k exp(-s t_k) E[D_k]
+    for any spread s, so these prices give the control variate its mean. They come from one large
+    antithetic Sobol / Brownian-bridge run (integration error around 1e-8 for the usual horizons),
+    shared by every bond and spread with the same r0, sigma and step grid.
+    """
+    key = (float(r0), float(sigma), int(years * frequency), int(frequency), int(n_paths), seed)
+    prices = _zero_price_cache.get(key)
+    if prices is not None:
+        _zero_price_cache.move_to_end(key)
+        return prices
+    rates = simulate_short_rates(r0, sigma, years, frequency, n_paths, seed, antithetic=True, sampler='sobol')
+    prices = path_discount_factors(rates, frequency).mean(axis=0)
+    prices.flags.writeable = False
+    _zero_price_cache[key] = prices
+    if len(_zero_price_cache) > ZERO_PRICE_CACHE_SIZE:
+        _zero_price_cache.popitem(last=False)
+    return prices
+
+
+# --- Spread Pricing ---
+
+def price_oas_spreads(pv_flows, t, oas_spreads, antithetic=False, control_flows=None, control_mean=None):
+    """
+    Price a vector of OAS spreads off one set of discounted path cash flows.
+
+    Args:
+        pv_flows (np.ndarray): Zero-spread discounted cash flows, shape (n_paths, n_steps).
+        t (np.ndarray): Step times, shape (n_steps,).
+        oas_spreads (array-like): Spreads to price.
+        antithetic (bool): Average antithetic pairs before estimating the standard error.
+        control_flows (np.ndarray, optional): Discounted cash flows of a control instrument on the same
+            paths (e.g. the non-callable bond), shape (n_paths, n_steps).
+        control_mean (np.ndarray, optional): Exact expected value of the control per spread.
+
+    Returns:
+        tuple: (price, stderr) arrays with one entry per spread.
+    """
+    spreads = np.atleast_1d(np.asarray(oas_spreads, dtype=float))
+    spread_discount = np.exp(-np.outer(t, spreads))
+    path_prices = pv_flows @ spread_discount
+    control = None if control_flows is None else control_flows @ spread_discount
+    if antithetic:
+        half = path_prices.shape[0] // 2
+        path_prices = 0.5 * (path_prices[:half] + path_prices[half:])
+        if control is not None:
+            control = 0.5 * (control[:half] + control[half:])
+    if control is not None:
+        # optimal coefficient per spread: beta = cov(Y, X) / var(X)
+        centered = control - control.mean(axis=0)
+        beta = ((path_prices - path_prices.mean(axis=0)) * centered).sum(axis=0) / (centered ** 2).sum(axis=0)
+        path_prices = path_prices - beta * (control - control_mean)
+    price = path_prices.mean(axis=0)
+    stderr = path_prices.std(axis=0, ddof=1) / np.sqrt(path_prices.shape[0])
+    return price, stderr
+
+
+def oas_model_batch(face_value, coupon_rate, years, oas_spreads, call_price, call_year,
+                    r0=0.03, sigma=0.01, frequency=2, n_paths=10000, rng=None, antithetic=False,
+                    return_stderr=False, sampler='pseudo', control_variate=False, n_replications=None, rates=None):
+    """
+    Batched replacement for oas_model: one simulation, every spread in a single matrix product.
+
+    Args:
+        oas_spreads (array-like): OAS spreads to price against the same simulated paths.
+        rng (np.random.Generator or int or None): Generator or seed for reproducible paths.
+        antithetic (bool): Use antithetic variates.
+        return_stderr (bool): Also return the Monte Carlo standard error per spread.
+        sampler (str): 'pseudo' or 'sobol' (scrambled Sobol with Brownian-bridge construction).
+        control_variate (bool): Use the non-callable bond on the same paths as a control variate.
+        n_paths (int): Minimum number of paths; see simulate_path_blocks for the rounding.
+        n_replications (int, optional): Independent randomizations the paths are split into; the
+            standard error is taken across their estimates. Defaults to 16 for 'sobol' (randomized QMC,
+            whose points are not independent) and 1 for 'pseudo'. Must not exceed n_paths.
+        rates (np.ndarray, optional): Pre-simulated paths laid out as simulate_path_blocks returns them
+            (e.g. memory-mapped from a PathStore); the simulation is then skipped and rng / n_paths unused.
+            Paths may run past the bond's maturity but not stop short of it. Arrays from PathStore carry
+            their simulation settings in a `scenario` attribute, which must match r0, sigma, frequency,
+            antithetic, sampler and n_replications here; plain arrays cannot be checked, so they are
+            refused with control_variate=True (whose mean depends on r0 and sigma).
+
+    Returns:
+        np.ndarray or (np.ndarray, np.ndarray): Price per spread, plus standard errors when requested.
+    """
+    n_replications = n_replications or (16 if sampler == 'sobol' else 1)
+    n_steps = int(years * frequency)
+    if rates is None:
+        rates = simulate_path_blocks(r0, sigma, years, frequency, n_paths, rng, antithetic, sampler, n_replications)
+    else:
+        _check_supplied_rates(rates, n_steps, control_variate, r0=r0, sigma=sigma, frequency=frequency,
+                              antithetic=antithetic, sampler=sampler, n_replications=n_replications)
+    rates = rates[:, :n_steps + 1]
+    control_mean = None
+    if control_variate:
+        t = np.arange(1, int(years * frequency) + 1) / frequency
+        cash_flow = np.full(len(t), face_value * coupon_rate / frequency)
+        cash_flow[-1] += face_value
+        spreads = np.atleast_1d(np.asarray(oas_spreads, dtype=float))
+        control_mean = (cash_flow * model_zero_prices(r0, sigma, years, frequency)) @ np.exp(-np.outer(t, spreads))
+
+    estimates, stderrs = [], []
+    for block in np.split(rates, n_replications):
+        pv_flows, t = discounted_path_cashflows(block, face_value, coupon_rate, call_price, call_year, frequency)
+        control_flows = None
+        if control_variate:
+            control_flows, _ = discounted_path_cashflows(block, face_value, coupon_rate, call_price, None, frequency)
+        price, stderr = price_oas_spreads(pv_flows, t, oas_spreads, antithetic, control_flows, control_mean)
+        estimates.append(price)
+        stderrs.append(stderr)
+    if n_replications == 1:
+        price, stderr = estimates[0], stderrs[0]
+    else:
+        estimates = np.array(estimates)
+        price = estimates.mean(axis=0)
+        stderr = estimates.std(axis=0, ddof=1) / np.sqrt(n_replications)
+    if return_stderr:
+        return price, stderr
+    return price
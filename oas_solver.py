@@ -0,0 +1,144 @@
+from functools import lru_cache
+
+import numpy as np
+
+from oas_engine import discounted_path_cashflows, simulate_short_rates
+from path_store import get_path_store
+
+
+# --- Cached Common Random Numbers ---
+
+@lru_cache(maxsize=16)
+def cached_short_rates(r0, sigma, years, frequency=2, n_paths=10000, seed=42, antithetic=True):
+    """
+    Simulate the short-rate matrix once per parameter set and hand back the same read-only paths.
+
+    With BONDPRICER_PATH_STORE set, the paths are memory-mapped from the shared path store instead, so
+    other processes and later runs reuse them without simulating.
+    """
+    store = get_path_store()
+    if store is not None:
+        return store.short_rates(r0, sigma, years, frequency, n_paths, seed, antithetic)
+    rates = simulate_short_rates(r0, sigma, years, frequency, n_paths, np.random.default_rng(seed), antithetic)
+    rates.flags.writeable = False
+    return rates
+
+
+def expected_discounted_flows(rates, face_value, coupon_rate, years, call_price, call_year, frequency=2):
+    """
+    Collapse the path matrix to the expected zero-spread discounted cash flow on each step.
+
+    Because the call decision does not depend on the spread, price(s) = sum_k A_k * exp(-s * t_k),
+    so every root-finder iteration is a single discount multiply over n_steps values.
+    """
+    n_steps = int(years * frequency)
+    pv_flows, t = discounted_path_cashflows(rates[:, :n_steps + 1], face_value, coupon_rate, call_price, call_year,
+                                            frequency)
+    return pv_flows.mean(axis=0), t
+
+
+# --- Vectorized Safeguarded Newton ---
+
+def _price_residual(flows, t, spread, prices):
+    return (flows * np.exp(-spread[:, None] * t)).sum(axis=1) - prices
+
+
+def _newton_bracketed(flows, t, prices, lower, upper, tol=1e-10, max_iter=100):
+    """
+    Solve sum_k flows[n, k] * exp(-s[n] * t_k) = prices[n] for every row at once.
+
+    Newton steps that leave the current bracket fall back to bisection, so each row converges
+    as reliably as Brent's method while the whole batch moves together. Rows whose price is not
+    bracketed by (lower, upper), or whose residual is still above tol after max_iter, come back as NaN.
+
+    Returns:
+        tuple: (spread, residual) per row; the residual is taken at the returned spread (before NaN masking).
+    """
+    lower = np.full(len(prices), lower, dtype=float)
+    upper = np.full(len(prices), upper, dtype=float)
+    # price is decreasing in the spread: the root is bracketed when the residual changes sign
+    bracketed = (_price_residual(flows, t, lower, prices) >= 0) & (_price_residual(flows, t, upper, prices) <= 0)
+    spread = 0.5 * (lower + upper)
+    for _ in range(max_iter):
+        discounted = flows * np.exp(-spread[:, None] * t)
+        residual = discounted.sum(axis=1) - prices
+        if np.all((np.abs(residual) < tol) | ~bracketed):
+            break
+        slope = -(discounted * t).sum(axis=1)
+
+        # a positive residual means the root lies above
+        above = residual > 0
+        lower = np.where(above, spread, lower)
+        upper = np.where(above, upper, spread)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = spread - residual / slope
+        inside = np.isfinite(newton) & (newton > lower) & (newton < upper)
+        spread = np.where(inside, newton, 0.5 * (lower + upper))
+    residual = _price_residual(flows, t, spread, prices)
+    return np.where(bracketed & (np.abs(residual) <= tol), spread, np.nan), residual
+
+
+# --- Public API ---
+
+def solve_oas(price, face_value, coupon_rate, years, call_price, call_year, r0=0.03, sigma=0.01, frequency=2,
+              n_paths=10000, seed=42, antithetic=True, bracket=(-0.05, 0.50), tol=1e-10):
+    """
+    Invert a market price to its option-adjusted spread against fixed, cached short-rate paths.
+
+    Args:
+        price (float): Market price to match.
+        face_value, coupon_rate, years, call_price, call_year: Callable bond terms as in oas_model.
+        r0, sigma, frequency, n_paths, seed, antithetic: Short-rate simulation settings.
+        bracket (tuple): Lower and upper spread bounds for the search.
+        tol (float): Absolute price tolerance.
+
+    Returns:
+        float: The OAS that reprices the bond to the given price, or NaN when the price lies outside
+        the bracket or the search does not converge to tol.
+    """
+    rates = cached_short_rates(r0, sigma, years, frequency, n_paths, seed, antithetic)
+    flows, t = expected_discounted_flows(rates, face_value, coupon_rate, years, call_price, call_year, frequency)
+    spread, _ = _newton_bracketed(flows[None, :], t, np.array([price], dtype=float), *bracket, tol=tol)
+    return float(spread[0])
+
+
+def solve_oas_bulk(prices, face_value, coupon_rate, years, call_price, call_year, r0=0.03, sigma=0.01, frequency=2,
+                   n_paths=10000, seed=42, antithetic=True, bracket=(-0.05, 0.50), tol=1e-10, return_residuals=False):
+    """
+    Solve OAS for a whole book of callables sharing one simulation and one vectorized root search.
+
+    Bonds are grouped by (maturity, call date, call price). Within a group the expected discounted
+    flows are linear in face value and coupon, so each group costs three path aggregations no matter
+    how many bonds it holds. All arguments except the simulation settings may be arrays of length N.
+
+    Returns:
+        np.ndarray or (np.ndarray, np.ndarray): OAS per bond (NaN where the price is not bracketed or the
+        search does not converge), plus the final price residuals when requested.
+    """
+    prices, face_value, coupon_rate, years, call_price, call_year = (
+        np.atleast_1d(x).astype(float) for x in np.broadcast_arrays(
+            prices, face_value, coupon_rate, years, call_price, call_year))
+
+    rates = cached_short_rates(r0, sigma, float(years.max()), frequency, n_paths, seed, antithetic)
+    n_steps = (years * frequency).astype(int)
+    t = np.arange(1, n_steps.max() + 1) / frequency
+    flows = np.zeros((len(prices), len(t)))
+
+    terms = np.column_stack([years, call_year, call_price])
+    groups, inverse = np.unique(terms, axis=0, return_inverse=True)
+    for g, (g_years, g_call_year, g_call_price) in enumerate(groups):
+        rows = np.flatnonzero(inverse.ravel() == g)
+        terms_g = (g_years, g_call_price, g_call_year, frequency)
+        call_only, _ = expected_discounted_flows(rates, 0.0, 0.0, *terms_g)
+        principal, _ = expected_discounted_flows(rates, 1.0, 0.0, *terms_g)
+        with_coupon, _ = expected_discounted_flows(rates, 1.0, 1.0, *terms_g)
+        principal -= call_only
+        coupon = with_coupon - call_only - principal
+        k = len(call_only)
+        flows[rows, :k] = call_only + face_value[rows, None] * (principal + coupon_rate[rows, None] * coupon)
+
+    spread, residual = _newton_bracketed(flows, t, prices, *bracket, tol=tol)
+    if return_residuals:
+        return spread, residual
+    return spread
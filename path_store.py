@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from oas_engine import oas_model_batch, simulate_path_blocks
+
+PATH_STORE_ENV = "BONDPRICER_PATH_STORE"
+SCENARIO_FORMAT_VERSION = 2  # bump whenever a simulator's output for the same parameters changes
+
+
+def scenario_key(kind, **params):
+    """
+    Stable digest of a scenario kind and its parameters (numbers as float64, so 2 and 2.0 match).
+
+    SCENARIO_FORMAT_VERSION is part of the digest, so paths written by an older simulator are never reused.
+    """
+    canonical = {name: float(value) if isinstance(value, (int, float, np.integer, np.floating))
+                 and not isinstance(value, bool) else value for name, value in params.items()}
+    text = json.dumps([SCENARIO_FORMAT_VERSION, kind, canonical], sort_keys=True)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+# --- Path Store ---
+
+class PathStore:
+    """
+    Simulated path matrices written once to disk as .npy files and memory-mapped read-only afterwards.
+
+    Each scenario is keyed by its kind, model parameters and integer seed, so every bond, spread and
+    pool worker asking for the same scenario reads the same file. Reads are zero-copy: the OS page
+    cache holds one copy of the paths however many processes map them, so RAM stays flat as workers
+    are added. Files are staged and renamed into place, so concurrent writers of the same key are safe
+    (both write identical paths and the last rename wins) and readers never see a partial file.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._mapped = {}
+        self.hits = self.writes = 0
+
+    def path(self, key):
+        return os.path.join(self.root, f'{key}.npy')
+
+    def __contains__(self, key):
+        return key in self._mapped or os.path.exists(self.path(key))
+
+    def get_or_simulate(self, kind, simulate, **params):
+        """
+        Memory-mapped paths for (kind, params), calling simulate(**params) and storing the result on a miss.
+
+        Returns:
+            np.memmap: Read-only path matrix, with the generating parameters in its `scenario` attribute
+            (oas_model_batch checks them against its own settings).
+        """
+        if params.get('seed') is None:
+            raise ValueError("An integer seed is required: unseeded paths cannot be reused.")
+        key = scenario_key(kind, **params)
+        paths = self._mapped.get(key)
+        if paths is not None:
+            self.hits += 1
+            return paths
+        if os.path.exists(self.path(key)):
+            self.hits += 1
+        else:
+            self._write(key, kind, params, np.ascontiguousarray(simulate(**params), dtype=float))
+        paths = np.load(self.path(key), mmap_mode='r')
+        paths.scenario = dict(params)
+        self._mapped[key] = paths
+        return paths
+
+    def _write(self, key, kind, params, paths):
+        fd, staging = tempfile.mkstemp(prefix='.staging-', suffix='.npy', dir=self.root)
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, paths)
+        with open(os.path.join(self.root, f'{key}.json'), 'w') as f:
+            json.dump({'kind': kind, 'version': SCENARIO_FORMAT_VERSION, 'shape': paths.shape, **params}, f)
+        os.replace(staging, self.path(key))
+        self.writes += 1
+
+    # --- scenarios ---
+
+    def short_rates(self, r0, sigma, years, frequency=2, n_paths=10000, seed=42, antithetic=False, sampler='pseudo',
+                    n_replications=1):
+        """
+        Lognormal short-rate paths as oas_model_batch simulates them for the same settings and integer seed,
+        so oas_model_batch(..., rates=store.short_rates(...)) prices identically to a fresh simulation.
+        """
+        return self.get_or_simulate('short_rates', _simulate_short_rates, r0=r0, sigma=sigma, years=years,
+                                    frequency=frequency, n_paths=n_paths, seed=seed, antithetic=antithetic,
+                                    sampler=sampler, n_replications=n_replications)
+
+    def benchmark_paths(self, initial_rate, volatility, days, n_paths=10000, floor=0.0, seed=42):
+        """Daily floored benchmark-rate paths (SIFMA / SOFR style), as frn.simulate_benchmark_paths draws them."""
+        return self.get_or_simulate('benchmark_paths', _simulate_benchmark_paths, initial_rate=initial_rate,
+                                    volatility=volatility, days=days, n_paths=n_paths, floor=floor, seed=seed)
+
+    # --- housekeeping ---
+
+    def entries(self):
+        """One row per stored scenario: key, kind, shape, size on disk and parameters."""
+        import pandas as pd
+
+        rows = []
+        for name in sorted(os.listdir(self.root)):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-5]
+            with open(os.path.join(self.root, name)) as f:
+                meta = json.load(f)
+            size = os.path.getsize(self.path(key)) if os.path.exists(self.path(key)) else 0
+            rows.append({'Key': key, 'Size (MB)': size / 2 ** 20, **meta})
+        return pd.DataFrame(rows)
+
+    def clear(self):
+        """Delete every stored scenario; arrays already mapped stay readable until released."""
+        self._mapped.clear()
+        for name in os.listdir(self.root):
+            os.remove(os.path.join(self.root, name))
+
+
+def _simulate_short_rates(r0, sigma, years, frequency, n_paths, seed, antithetic, sampler, n_replications):
+    return simulate_path_blocks(r0, sigma, years, frequency, n_paths, seed, antithetic, sampler, n_replications)
+
+
+def _simulate_benchmark_paths(initial_rate, volatility, days, n_paths, floor, seed):
+    from frn import simulate_benchmark_paths
+
+    return simulate_benchmark_paths(initial_rate, volatility, days, n_paths, floor, seed)
+
+
+_path_store = None
+
+
+def get_path_store():
+    """
+    Process-wide store at BONDPRICER_PATH_STORE, built on first use (None when the variable is unset).
+
+    Nothing is created at import time, so importing a pricer never touches the file system.
+    """
+    global _path_store
+    root = os.environ.get(PATH_STORE_ENV)
+    if not root:
+        return None
+    if _path_store is None or _path_store.root != root:
+        _path_store = PathStore(root)
+    return _path_store
+
+
+# --- Main Execution ---
+
+SCENARIO = dict(r0=0.03, sigma=0.2, years=10, frequency=2, n_paths=200_000, seed=7, antithetic=True)
+MODEL = {name: SCENARIO[name] for name in ('r0', 'sigma', 'frequency', 'antithetic')}
+
+
+def _price_bonds(root, bonds, spreads):
+    """Pool worker: price its bonds off the shared memory-mapped scenario."""
+    store = PathStore(root)
+    rates = store.short_rates(**SCENARIO)
+    return [oas_model_batch(100, coupon, years, spreads, 100, call_year, **MODEL, rates=rates)
+            for coupon, years, call_year in bonds]
+
+
+def main():
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    bonds = list(zip(rng.uniform(0.03, 0.07, 40).round(4), rng.integers(5, 11, 40), rng.integers(2, 5, 40)))
+    spreads = np.linspace(0.0, 0.05, 11)
+    simulate = dict(SCENARIO, sampler='pseudo', n_replications=1)
+
+    # what the nightly run did before: regenerate the same scenario for every bond
+    start = time.perf_counter()
+    fresh = [oas_model_batch(100, coupon, years, spreads, 100, call_year, **MODEL,
+                             rates=_simulate_short_rates(**simulate)) for coupon, years, call_year in bonds]
+    fresh_time = time.perf_counter() - start
+
+    root = tempfile.mkdtemp(prefix='path_store_')
+    try:
+        store = PathStore(root)
+        start = time.perf_counter()
+        rates = store.short_rates(**SCENARIO)
+        write_time = time.perf_counter() - start
+        start = time.perf_counter()
+        stored = [oas_model_batch(100, coupon, years, spreads, 100, call_year, **MODEL, rates=rates)
+                  for coupon, years, call_year in bonds]
+        stored_time = time.perf_counter() - start
+
+        print(f"\n📊 Nightly OAS Run: {len(bonds)} callables x {len(spreads)} spreads, "
+              f"{SCENARIO['n_paths']:,} paths x {rates.shape[1]} steps\n")
+        print(pd.DataFrame([
+            {'Mode': 'Simulate per bond', 'Time (s)': fresh_time, 'Simulations': len(bonds)},
+            {'Mode': 'Path store', 'Time (s)': write_time + stored_time, 'Simulations': store.writes},
+        ]).round(3).to_string(index=False))
+        print(f"\nOne-off write {write_time:.3f}s; mapped as {type(rates).__name__}, read-only: "
+              f"{not rates.flags.writeable}; max |diff| vs simulation: "
+              f"{max(np.abs(a - b).max() for a, b in zip(fresh, stored)):.1e}")
+
+        start = time.perf_counter()
+        chunks = [bonds[i::4] for i in range(4)]
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            pooled = list(pool.map(_price_bonds, [root] * 4, chunks, [spreads] * 4))
+        pooled_time = time.perf_counter() - start
+        pooled = [price for i in range(len(bonds)) for price in [pooled[i % 4][i // 4]]]
+        print(f"\n📊 4 Pool Workers on the Same Mapped File: {pooled_time:.3f}s, "
+              f"identical: {all(np.array_equal(a, b) for a, b in zip(stored, pooled))}\n")
+
+        # paths remember how they were simulated: wrong settings or a longer bond are refused
+        bond = dict(face_value=100, coupon_rate=0.05, years=5, oas_spreads=spreads, call_price=100, call_year=3)
+        for label, call in [('default sigma', dict(bond, antithetic=True)),
+                            ('15y bond on 10y paths', dict(bond, **MODEL, years=15))]:
+            try:
+                oas_model_batch(**call, rates=rates)
+            except ValueError as error:
+                print(f"Refused ({label}): {error}")
+        print()
+
+        store.benchmark_paths(2.0, 0.10, 90, n_paths=10_000, seed=42)
+        print(store.entries()[['kind', 'shape', 'n_paths', 'seed', 'Size (MB)']].round(2).to_string(index=False))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
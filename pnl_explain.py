@@ -0,0 +1,174 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from discounting import annuity_factors, convention_codes, discount_factors
+
+TRADE_COLUMNS = ['trade_id', 'notional', 'coupon_rate', 'ttm', 'frequency', 'convention', 'curve']
+
+
+# --- Vectorized Valuation ---
+
+def value_bonds(notional, coupon_rate, ttm, frequency, convention, rate):
+    """
+    Present value of N coupon (or zero-coupon) bonds.
+
+    Coupons fall at ttm, ttm - 1/f, ... > 0; a zero coupon rate reduces to valuation_zero_coupon_bond.
+    Bonds with ttm <= 0 have matured and are worth nothing. convention takes names or discounting codes.
+    """
+    convention = convention_codes(convention)
+    notional, coupon_rate, ttm, frequency, rate = (np.asarray(x, dtype=float)
+                                                   for x in (notional, coupon_rate, ttm, frequency, rate))
+    n_coupons = np.ceil(np.maximum(ttm, 0.0) * frequency - 1e-9)
+    coupon = notional * coupon_rate / frequency
+    coupon_pv = coupon * annuity_factors(rate, ttm, frequency, n_coupons, convention)
+    principal_df = discount_factors(rate, np.maximum(ttm, 0.0), convention)
+    principal_pv = np.where(ttm > 0, notional * principal_df, 0.0)
+    return coupon_pv + principal_pv
+
+
+def cash_received(notional, coupon_rate, ttm, frequency, dt):
+    """Coupons and principal falling in (0, dt] on yesterday's clock."""
+    notional, coupon_rate, ttm, frequency = (np.asarray(x, dtype=float)
+                                             for x in (notional, coupon_rate, ttm, frequency))
+    coupon = notional * coupon_rate / frequency
+    # coupon dates sit at ttm - j/f; those in (0, dt] are j = ceil((ttm - dt) f), ..., ceil(ttm f) - 1
+    first = np.maximum(np.ceil((ttm - dt) * frequency - 1e-9), 0.0)
+    end = np.ceil(np.maximum(ttm, 0.0) * frequency - 1e-9)
+    n_paid = np.clip(end - first, 0.0, None)
+    matured = (ttm > 0) & (ttm <= dt)
+    return coupon * n_paid + np.where(matured, notional, 0.0)
+
+
+# --- PnL Explain ---
+
+def explain_pnl(positions_prev, positions_today, market_prev, market_today, dt=1 / 360):
+    """
+    Theta / hypothetical / position / comprehensive PnL per trade and for the whole book.
+
+    V1: yesterday's positions at yesterday's market and time to maturity.
+    V2: yesterday's positions, yesterday's market, aged by dt (theta).
+    V3: yesterday's positions, today's market, aged by dt (hypothetical).
+    V4: today's positions at today's market (position).
+
+    All valuations go through one batched value_bonds call. V3 reuses V2 for curves that did not move,
+    and V4 reuses V3 for trades whose terms did not change, so each trade is repriced only as often
+    as its inputs actually differ.
+
+    Args:
+        positions_prev (pd.DataFrame): Yesterday's trades with TRADE_COLUMNS, ttm as of yesterday.
+        positions_today (pd.DataFrame): Today's trades with TRADE_COLUMNS, ttm as of today.
+        market_prev (dict or pd.Series): Yesterday's rate per curve.
+        market_today (dict or pd.Series): Today's rate per curve.
+        dt (float): Year fraction between the two valuation dates.
+
+    Returns:
+        tuple: (per_trade, aggregate) DataFrames.
+    """
+    market_prev, market_today = pd.Series(market_prev, dtype=float), pd.Series(market_today, dtype=float)
+    book = positions_prev[TRADE_COLUMNS].merge(positions_today[TRADE_COLUMNS], on='trade_id', how='outer',
+                                               suffixes=('_prev', '_today'))
+    held_prev = book['notional_prev'].notna().values
+    held_today = book['notional_today'].notna().values
+    prev = {c: book[f'{c}_prev'].values for c in TRADE_COLUMNS[1:]}
+    today = {c: book[f'{c}_today'].values for c in TRADE_COLUMNS[1:]}
+    # map convention names to codes once for the whole book
+    for terms, held in ((prev, held_prev), (today, held_today)):
+        codes = np.full(len(book), -1)
+        codes[held] = convention_codes(terms['convention'][held])
+        terms['convention'] = codes
+
+    rate_prev = market_prev.reindex(prev['curve']).values
+    rate_today_on_prev = market_today.reindex(prev['curve']).values
+    moved = held_prev & (rate_today_on_prev != rate_prev)
+    # a day is ~2.7e-3 years: an absolute tolerance far below it catches any genuine term change at any maturity
+    changed = held_today & ~(held_prev
+                             & (today['notional'] == prev['notional'])
+                             & (today['coupon_rate'] == prev['coupon_rate'])
+                             & np.isclose(today['ttm'], prev['ttm'] - dt, rtol=0, atol=1e-9)
+                             & (today['frequency'] == prev['frequency'])
+                             & (today['convention'] == prev['convention'])
+                             & (today['curve'] == prev['curve']))
+
+    # stack every valuation that is actually needed into one batch
+    requests = [
+        (held_prev, prev, prev['ttm'], rate_prev),
+        (held_prev, prev, prev['ttm'] - dt, rate_prev),
+        (moved, prev, prev['ttm'] - dt, rate_today_on_prev),
+        (changed, today, today['ttm'], market_today.reindex(today['curve']).values),
+    ]
+    rows = [np.flatnonzero(sel) for sel, *_ in requests]
+
+    def stack(field):
+        return np.concatenate([terms[field][r] for r, (_, terms, _, _) in zip(rows, requests)])
+
+    values = value_bonds(stack('notional'), stack('coupon_rate'),
+                         np.concatenate([ttm[r] for r, (_, _, ttm, _) in zip(rows, requests)]),
+                         stack('frequency'), stack('convention'),
+                         np.concatenate([rate[r] for r, (_, _, _, rate) in zip(rows, requests)]))
+    V = np.zeros((4, len(book)))
+    offsets = np.cumsum([0] + [len(r) for r in rows])
+    for k, r in enumerate(rows):
+        V[k, r] = values[offsets[k]:offsets[k + 1]]
+    V[2] = np.where(held_prev & ~moved, V[1], V[2])
+    V[3] = np.where(held_today & ~changed, V[2], V[3])
+
+    r = rows[0]
+    cash_flows = np.zeros(len(book))
+    cash_flows[r] = cash_received(prev['notional'][r], prev['coupon_rate'][r], prev['ttm'][r], prev['frequency'][r], dt)
+
+    per_trade = pd.DataFrame({
+        'trade_id': book['trade_id'].values,
+        'V1': V[0], 'V2': V[1], 'V3': V[2], 'V4': V[3],
+        'Cash Flows': cash_flows,
+        'Theta (Time)': V[1] - V[0],
+        'Hypothetical PnL (Market)': V[2] - V[1],
+        'Position PnL (Activity)': V[3] - V[2] + cash_flows,
+        'Comprehensive PnL': V[3] - V[0] + cash_flows,
+    })
+    components = ['Theta (Time)', 'Hypothetical PnL (Market)', 'Position PnL (Activity)', 'Comprehensive PnL']
+    aggregate = pd.DataFrame({'PnL Component': components, 'Value': per_trade[components].sum().values})
+    return per_trade, aggregate
+
+
+# --- Main Execution ---
+
+def make_book(n_trades, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'trade_id': np.arange(n_trades),
+        'notional': rng.choice([100.0, 1_000.0, 10_000.0], size=n_trades),
+        'coupon_rate': np.where(rng.random(n_trades) < 0.3, 0.0, rng.uniform(0.01, 0.08, size=n_trades)),
+        'ttm': rng.uniform(0.01, 30.0, size=n_trades),
+        'frequency': rng.choice([1, 2, 4], size=n_trades).astype(float),
+        'convention': rng.choice(['annual', 'semi-annual', 'continuous', 'simple', 'act/360'], size=n_trades),
+        'curve': rng.choice(['USD', 'EUR', 'GBP'], size=n_trades),
+    })
+
+
+def main():
+    # The single zero-coupon example from cleanPnL_decomp_v2.py
+    example = pd.DataFrame([{'trade_id': 1, 'notional': 100.0, 'coupon_rate': 0.0, 'ttm': 1.0, 'frequency': 1.0,
+                             'convention': 'annual', 'curve': 'USD'}])
+    example_today = example.assign(ttm=359 / 360)
+    _, aggregate = explain_pnl(example, example_today, {'USD': 0.04}, {'USD': 0.06}, dt=1 / 360)
+    print("\n📊 Zero Coupon Bond PnL Using TTM Logic\n")
+    print(aggregate.to_string(index=False))
+
+    # Whole-book run: curves move, 1% of trades are resized
+    n_trades = 100_000
+    book_prev = make_book(n_trades)
+    book_today = book_prev.assign(ttm=book_prev['ttm'] - 1 / 360)
+    resized = book_today.sample(frac=0.01, random_state=1).index
+    book_today.loc[resized, 'notional'] *= 2
+    start = time.perf_counter()
+    per_trade, aggregate = explain_pnl(book_prev, book_today, {'USD': 0.040, 'EUR': 0.025, 'GBP': 0.045},
+                                       {'USD': 0.041, 'EUR': 0.025, 'GBP': 0.044})
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 Book PnL Explain ({n_trades:,} trades in {elapsed:.2f}s)\n")
+    print(aggregate.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
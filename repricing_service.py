@@ -0,0 +1,288 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from cashflow_schedule import CashflowSchedule, bullet_schedule, cached_schedule
+from curves import DiscountCurve, TermStructure, survival_probability
+from survival_batch import survival_pricing_schedule
+
+
+# --- Incremental Repricing Service ---
+
+class RepricingService:
+    """
+    Intraday book of survival-priced positions that reprices only what a market tick touches.
+
+    Market inputs are the nodes of one risk-free DiscountCurve, a hazard rate (or HazardCurve) per
+    issuer, and named benchmark rates that set floater coupons. A dependency index maps each input to
+    the positions that use it:
+
+    - curve node k moves the curve beyond times[k - 1], so it reaches every position paying after that;
+    - an issuer's hazard reaches that issuer's positions;
+    - a benchmark reaches the floaters that reset on it.
+
+    Schedules and the per-period discount / survival vectors are cached, so a tick only refreshes the
+    affected rows of the cached grids and reprices those rows. Book and per-issuer PV are kept current
+    by adding the change in PV, never by summing the book again.
+    """
+
+    def __init__(self, discount_curve, hazard_rates, benchmarks=None):
+        if not isinstance(discount_curve, DiscountCurve):
+            discount_curve = DiscountCurve.flat(discount_curve)
+        self.discount_curve = discount_curve
+        self.hazard_rates = dict(hazard_rates)
+        self.benchmarks = dict(benchmarks or {})
+        self.issuers = list(self.hazard_rates)
+        self._issuer_code = {issuer: i for i, issuer in enumerate(self.issuers)}
+        self.schedule = None
+        self.ticks = 0
+        self.repriced = 0
+
+    # --- positions ---
+
+    def add_positions(self, schedule, issuer, recovery_rate=0.4, quantity=1.0, benchmark=None, spread=0.0):
+        """
+        Add a block of positions (one per schedule row).
+
+        issuer may be one name or one per row and must have a hazard rate. A benchmark name turns the
+        block into floaters paying outstanding * (benchmark + spread) / frequency instead of the
+        schedule's fixed coupons.
+
+        Returns:
+            np.ndarray: Position ids of the new rows.
+        """
+        n_new = len(schedule)
+        issuer = np.broadcast_to(np.asarray(issuer, dtype=object), (n_new,))
+        unknown = set(issuer) - set(self._issuer_code)
+        if unknown:
+            raise ValueError(f"No hazard rate for issuer(s) {sorted(unknown)}.")
+        if benchmark is not None and benchmark not in self.benchmarks:
+            raise ValueError(f"Unknown benchmark {benchmark!r}.")
+        block = {
+            'issuer': np.array([self._issuer_code[name] for name in issuer]),
+            'recovery': np.broadcast_to(np.asarray(recovery_rate, dtype=float), (n_new,)).copy(),
+            'quantity': np.broadcast_to(np.asarray(quantity, dtype=float), (n_new,)).copy(),
+            'benchmark': np.full(n_new, benchmark, dtype=object),
+            'spread': np.broadcast_to(np.asarray(spread, dtype=float), (n_new,)).copy(),
+        }
+        start = 0 if self.schedule is None else len(self.schedule)
+        if self.schedule is None:
+            self.schedule, self._static = schedule, block
+        else:
+            self.schedule = CashflowSchedule.concat([self.schedule, schedule])
+            self._static = {name: np.concatenate([self._static[name], block[name]]) for name in block}
+        self._build()
+        return np.arange(start, start + n_new)
+
+    def _build(self):
+        """(Re)build the dependency index, the cached grids and every PV; called when positions change."""
+        schedule = self.schedule
+        last_payment = np.where(schedule.mask, schedule.times, 0.0).max(axis=1)
+        # rows are held in order of last payment, so a curve node's dependents are one contiguous slice
+        order = np.argsort(last_payment, kind='stable')
+        self.position_ids = order
+        self._last_payment = last_payment[order]
+        self._times, self._mask, self._frequency = schedule.times[order], schedule.mask[order], schedule.frequency[order]
+        self._principal, self._outstanding = schedule.principal[order], schedule.outstanding[order]
+        self._coupon = np.array(schedule.coupon[order])
+        self._rows = {name: values[order] for name, values in self._static.items()}
+        self._issuer_rows = {code: np.flatnonzero(self._rows['issuer'] == code) for code in range(len(self.issuers))}
+        self._benchmark_rows = {name: np.flatnonzero(self._rows['benchmark'] == name) for name in self.benchmarks}
+
+        self._survival = np.empty(self._times.shape)
+        self._survival_prev = np.empty(self._times.shape)
+        self._discount = np.exp(-self.discount_curve.integral(self._times))
+        self._weight = np.empty(self._times.shape)
+        for rows in self._issuer_rows.values():
+            self._refresh_survival(rows)
+        for rows in self._benchmark_rows.values():
+            self._refresh_coupon(rows)
+        everything = slice(None)
+        self._refresh_weight(everything)
+        self._pv = self._price_rows(everything)
+        self.issuer_pv = np.bincount(self._rows['issuer'], weights=self._pv, minlength=len(self.issuers))
+        self.book_pv = float(self._pv.sum())
+
+    @property
+    def pv(self):
+        """PV per position, in position-id order."""
+        pv = np.empty_like(self._pv)
+        pv[self.position_ids] = self._pv
+        return pv
+
+    def node_dependents(self, node):
+        """Slice of (maturity-ordered) rows whose PV depends on discount-curve node `node`."""
+        start = 0.0 if node == 0 else self.discount_curve.times[node - 1]
+        return slice(np.searchsorted(self._last_payment, start, side='right'), None)
+
+    # --- cached grids ---
+
+    def _refresh_survival(self, rows):
+        if len(rows) == 0:
+            return
+        hazard = self.hazard_rates[self.issuers[self._rows['issuer'][rows[0]]]]
+        t = self._times[rows]
+        self._survival[rows] = survival_probability(hazard, t)
+        self._survival_prev[rows] = survival_probability(hazard, t - 1 / self._frequency[rows, None])
+
+    def _refresh_coupon(self, rows):
+        if len(rows) == 0:
+            return
+        rate = self.benchmarks[self._rows['benchmark'][rows[0]]] + self._rows['spread'][rows]
+        self._coupon[rows] = np.where(self._mask[rows], self._outstanding[rows] * rate[:, None]
+                                      / self._frequency[rows, None], 0.0)
+
+    def _refresh_weight(self, rows):
+        """Undiscounted expected cash flow per cell: the PV of a row is its weights dotted with its discount factors."""
+        survival = self._survival[rows]
+        weight = (self._coupon[rows] + self._principal[rows]) * survival
+        weight += self._rows['recovery'][rows, None] * self._outstanding[rows] * (self._survival_prev[rows] - survival)
+        self._weight[rows] = np.where(self._mask[rows], weight * self._rows['quantity'][rows, None], 0.0)
+
+    def _price_rows(self, rows):
+        return np.einsum('ij,ij->i', self._weight[rows], self._discount[rows])
+
+    def _reprice(self, rows):
+        new = self._price_rows(rows)
+        change = new - self._pv[rows]
+        self._pv[rows] = new
+        self.issuer_pv += np.bincount(self._rows['issuer'][rows], weights=change, minlength=len(self.issuers))
+        total = float(change.sum())
+        self.book_pv += total
+        self.ticks += 1
+        self.repriced += len(new)
+        return len(new), total
+
+    # --- market ticks ---
+
+    def update_rate(self, node, rate):
+        """
+        Move one discount-curve node (forward or zero rate, per the curve's interpolation).
+
+        With piecewise-constant forwards the node only rescales discount factors by
+        exp(-change * time spent in its segment), so the cached factors are updated in place;
+        a linear zero curve is re-read for the dependent rows.
+
+        Returns:
+            tuple: (positions repriced, change in book PV).
+        """
+        curve = self.discount_curve
+        rates = curve.rates.copy()
+        change, rates[node] = rate - rates[node], rate
+        self.discount_curve = type(curve)(curve.times, rates, curve.interpolation)
+        rows = self.node_dependents(node)
+        times = self._times[rows]
+        if curve.interpolation == 'piecewise_constant':
+            start = 0.0 if node == 0 else curve.times[node - 1]
+            end = np.inf if node == len(curve.times) - 1 else curve.times[node]
+            factor = np.subtract(times, start)
+            np.clip(factor, 0.0, end - start, out=factor)
+            factor *= -change
+            self._discount[rows] *= np.exp(factor, out=factor)
+        else:
+            self._discount[rows] = np.exp(-self.discount_curve.integral(times))
+        return self._reprice(rows)
+
+    def update_hazard(self, issuer, hazard_rate):
+        """Replace an issuer's hazard rate or HazardCurve. Returns (positions repriced, change in book PV)."""
+        if issuer not in self._issuer_code:
+            raise ValueError(f"Unknown issuer {issuer!r}.")
+        self.hazard_rates[issuer] = hazard_rate
+        rows = self._issuer_rows[self._issuer_code[issuer]]
+        self._refresh_survival(rows)
+        self._refresh_weight(rows)
+        return self._reprice(rows)
+
+    def update_benchmark(self, name, rate):
+        """Reset a benchmark rate and the coupons of its floaters. Returns (positions repriced, change in book PV)."""
+        if name not in self.benchmarks:
+            raise ValueError(f"Unknown benchmark {name!r}.")
+        self.benchmarks[name] = rate
+        rows = self._benchmark_rows[name]
+        self._refresh_coupon(rows)
+        self._refresh_weight(rows)
+        return self._reprice(rows)
+
+    def apply(self, tick):
+        """Dispatch a (kind, key, value) tick with kind 'rate', 'hazard' or 'benchmark'."""
+        kind, key, value = tick
+        handlers = {'rate': self.update_rate, 'hazard': self.update_hazard, 'benchmark': self.update_benchmark}
+        if kind not in handlers:
+            raise ValueError(f"Unknown tick kind {kind!r}.")
+        return handlers[kind](key, value)
+
+    # --- reports ---
+
+    def issuer_report(self):
+        return pd.DataFrame({'Issuer': self.issuers, 'PV': self.issuer_pv,
+                             'Positions': [len(self._issuer_rows[i]) for i in range(len(self.issuers))]})
+
+    def full_reprice(self):
+        """From-scratch PV per position (position-id order) through survival_pricing_schedule, for checks."""
+        pv = np.empty(len(self._pv))
+        for code, rows in self._issuer_rows.items():
+            hazard = self.hazard_rates[self.issuers[code]]
+            if not isinstance(hazard, TermStructure):
+                hazard = np.full(len(rows), hazard)
+            sub = CashflowSchedule(self._times[rows], self._mask[rows], self._frequency[rows], self._coupon[rows],
+                                   self._principal[rows], self._outstanding[rows])
+            pv[self.position_ids[rows]] = self._rows['quantity'][rows] * survival_pricing_schedule(
+                sub, self.discount_curve, hazard, self._rows['recovery'][rows])
+        return pv
+
+
+# --- Main Execution ---
+
+def main():
+    rng = np.random.default_rng(0)
+    n_issuers, n_bonds = 200, 100_000
+    pillars = np.array([0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+    curve = DiscountCurve(pillars, 0.03 + 0.01 * np.log1p(pillars) / np.log1p(30))
+    issuers = [f'ISSUER-{i:03d}' for i in range(n_issuers)]
+    service = RepricingService(curve, dict(zip(issuers, rng.uniform(0.005, 0.08, n_issuers))),
+                               benchmarks={'SOFR': 0.043})
+
+    start = time.perf_counter()
+    years = rng.integers(1, 31, size=n_bonds).astype(float)
+    service.add_positions(bullet_schedule(100.0, rng.uniform(0.02, 0.08, n_bonds), years, 2),
+                          rng.choice(issuers, size=n_bonds), rng.uniform(0.2, 0.6, n_bonds), rng.choice([1, 5, 10], n_bonds))
+    frn = cached_schedule('bullet', face_value=100.0, coupon_rate=0.0, years=np.full(5_000, 3.0), frequency=4)
+    service.add_positions(frn, rng.choice(issuers, size=5_000), 0.4, 10.0, benchmark='SOFR', spread=0.01)
+    print(f"\n📊 Book Built: {len(service.schedule):,} positions, {n_issuers} issuers, "
+          f"PV {service.book_pv:,.2f} ({time.perf_counter() - start:.2f}s)\n")
+
+    ticks = [('hazard', issuers[rng.integers(n_issuers)], rng.uniform(0.005, 0.08)) for _ in range(200)]
+    ticks += [('rate', int(node), 0.03 + rng.normal(0, 0.001)) for node in rng.integers(0, len(pillars), 50)]
+    ticks += [('benchmark', 'SOFR', 0.043 + rng.normal(0, 0.0005)) for _ in range(50)]
+    rng.shuffle(ticks)
+
+    latency = {'hazard': [], 'rate': [], 'benchmark': []}
+    touched = {'hazard': [], 'rate': [], 'benchmark': []}
+    for tick in ticks:
+        start = time.perf_counter()
+        n_rows, _ = service.apply(tick)
+        latency[tick[0]].append((time.perf_counter() - start) * 1e3)
+        touched[tick[0]].append(n_rows)
+    print("📊 Tick-to-PV Latency\n")
+    print(pd.DataFrame({
+        'Tick': list(latency),
+        'Count': [len(latency[k]) for k in latency],
+        'Avg Positions Repriced': [np.mean(touched[k]) for k in latency],
+        'p50 (ms)': [np.percentile(latency[k], 50) for k in latency],
+        'p99 (ms)': [np.percentile(latency[k], 99) for k in latency],
+    }).round(3).to_string(index=False))
+
+    start = time.perf_counter()
+    full = service.full_reprice()
+    full_ms = (time.perf_counter() - start) * 1e3
+    print(f"\n📊 Running Aggregates vs Full Reprice ({full_ms:.0f} ms)\n")
+    print(f"Book PV: {service.book_pv:,.6f} vs {full.sum():,.6f}")
+    print(f"Max |position diff|: {np.max(np.abs(service.pv - full)):.2e}")
+    print(f"Max |issuer diff|:   {np.max(np.abs(service.issuer_pv - np.bincount(service._static['issuer'], full, minlength=n_issuers))):.2e}")
+    print()
+    print(service.issuer_report().sort_values('PV', ascending=False).head(5).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
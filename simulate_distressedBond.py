@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+from curves import HazardCurve, discount_factor, survival_probability
+from pricing_kernels import survival_price
+
 # Shared parameters
 face_value = 100
 coupon_rate = 0.05
@@ -12,43 +15,19 @@ dt = 1 / frequency
 time_steps = np.arange(dt, years + dt, dt)
 
 def survival_based_npv(face_value, coupon_rate, risk_free_rate, hazard_rate, recovery_rate, time_steps):
-    npv = 0
     coupon = face_value * coupon_rate / frequency
-    for t in time_steps:
-        surv = np.exp(-hazard_rate * t)
-        surv_prev = np.exp(-hazard_rate * (t - dt))
-        default_prob = surv_prev - surv
-        discount = np.exp(-risk_free_rate * t)
-
-        npv += coupon * surv * discount
-        npv += recovery_rate * face_value * default_prob * discount
-
-    final_surv = np.exp(-hazard_rate * time_steps[-1])
-    final_discount = np.exp(-risk_free_rate * time_steps[-1])
-    final_leg = face_value * final_surv * final_discount
-    npv += final_leg
-    return npv
+    return survival_price(face_value, coupon, recovery_rate, risk_free_rate, hazard_rate, time_steps,
+                          time_steps - dt, time_steps[-1])
 
 # --- Case Definitions ---
 # Case 1: Bond becomes distressed halfway (B → CCC)
+# Survival integrates the B hazard up to the switch and the CCC hazard after it (piecewise-constant curve).
 def simulate_case_1():
     hazard_B = 0.05
     hazard_CCC = 0.30
     mid_index = int(len(time_steps) / 2)
-    npv = 0
-    coupon = face_value * coupon_rate / frequency
-    for i, t in enumerate(time_steps):
-        hazard = hazard_B if i < mid_index else hazard_CCC
-        surv = np.exp(-hazard * t)
-        surv_prev = np.exp(-hazard * (t - dt))
-        default_prob = surv_prev - surv
-        discount = np.exp(-risk_free_rate * t)
-        npv += coupon * surv * discount
-        npv += recovery_rate * face_value * default_prob * discount
-    final_surv = np.exp(-hazard_CCC * time_steps[-1])
-    final_discount = np.exp(-risk_free_rate * time_steps[-1])
-    npv += face_value * final_surv * final_discount
-    return npv
+    hazard_curve = HazardCurve([time_steps[mid_index - 1], time_steps[-1]], [hazard_B, hazard_CCC])
+    return survival_based_npv(face_value, coupon_rate, risk_free_rate, hazard_curve, recovery_rate, time_steps)
 
 # Case 2: Distressed from the start but still accrues
 def simulate_case_2():
@@ -76,10 +55,10 @@ def simulate_case_5():
     hazard = 0.35
     npv = 0
     for t in time_steps:
-        surv = np.exp(-hazard * t)
-        surv_prev = np.exp(-hazard * (t - dt))
+        surv = survival_probability(hazard, t)
+        surv_prev = survival_probability(hazard, t - dt)
         default_prob = surv_prev - surv
-        discount = np.exp(-risk_free_rate * t)
+        discount = discount_factor(risk_free_rate, t)
         # Only recovery leg (no coupons)
         npv += recovery_rate * face_value * default_prob * discount
     # No principal added since it's not paid
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from curves import TermStructure, discount_factor, survival_probability
+
+
+# --- Padded Time Grid ---
+
+def build_time_grid(years, frequency):
+    """
+    Build the padded (N x max_periods) coupon-time grid shared by every bond in a batch.
+
+    Args:
+        years (np.ndarray): Maturity in years per bond.
+        frequency (np.ndarray): Coupon frequency per bond.
+
+    Returns:
+        tuple: (t, mask, dt, periods) where t[n, i] = (i + 1) * dt[n] and mask flags the live periods.
+    """
+    dt = 1 / frequency
+    periods = (years * frequency).astype(int)
+    steps = np.arange(1, periods.max(initial=0) + 1)
+    t = steps * dt[:, None]
+    mask = steps <= periods[:, None]
+    return t, mask, dt, periods
+
+
+# --- Batch Survival-Based Pricing ---
+
+def survival_based_pricing_batch(face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate,
+                                 frequency=2, legs=False):
+    """
+    Vectorized survival_based_pricing for a whole book in one NumPy pass.
+
+    Every argument may be a scalar or an array of length N; scalars are broadcast across the book.
+    risk_free_rate and hazard_rate may also be a DiscountCurve / HazardCurve shared by the whole book.
+    The formula is identical to the per-period loop: coupon and recovery legs on each coupon date,
+    principal paid on survival to the last coupon date and discounted from maturity.
+
+    Args:
+        face_value (array-like): Face value per bond.
+        coupon_rate (array-like): Annual coupon rate per bond.
+        years (array-like): Maturity in years per bond.
+        risk_free_rate (array-like or DiscountCurve): Continuously-compounded risk-free rate or curve.
+        hazard_rate (array-like or HazardCurve): Hazard rate or curve.
+        recovery_rate (array-like): Recovery as a fraction of face value.
+        frequency (array-like): Coupon payments per year.
+        legs (bool): If True, also return the leg breakdown as a DataFrame.
+
+    Returns:
+        np.ndarray or (np.ndarray, pd.DataFrame): NPV per bond, plus the leg breakdown when requested.
+    """
+    if isinstance(risk_free_rate, TermStructure) or isinstance(hazard_rate, TermStructure):
+        return _survival_pricing_curves(face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate,
+                                        frequency, legs)
+
+    face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate, frequency = (
+        np.atleast_1d(x).astype(float) for x in np.broadcast_arrays(
+            face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate, frequency))
+
+    t, mask, dt, periods = build_time_grid(years, frequency)
+    # survival * discount shares one exponential; the default probability over (t - dt, t] is
+    # survival(t) * (exp(h * dt) - 1), so both running legs come from the same masked row sum.
+    survival_discount = np.where(mask, np.exp(-(hazard_rate + risk_free_rate)[:, None] * t), 0.0).sum(axis=1)
+
+    coupon = face_value * coupon_rate / frequency
+    coupon_leg = coupon * survival_discount
+    recovery_leg = recovery_rate * face_value * np.expm1(hazard_rate * dt) * survival_discount
+    final_survival = np.exp(-hazard_rate * periods * dt)
+    principal_leg = face_value * final_survival * np.exp(-risk_free_rate * years)
+
+    return assemble_legs(coupon_leg, recovery_leg, principal_leg, legs)
+
+
+def _survival_pricing_curves(face_value, coupon_rate, years, risk_free_rate, hazard_rate, recovery_rate,
+                             frequency, legs):
+    """Grid version of the batch pricer for term-structure inputs: curve lookups replace the flat exponentials."""
+    face_value, coupon_rate, years, recovery_rate, frequency = (
+        np.atleast_1d(x).astype(float) for x in np.broadcast_arrays(
+            face_value, coupon_rate, years, recovery_rate, frequency))
+    if not isinstance(risk_free_rate, TermStructure):
+        risk_free_rate = np.broadcast_to(np.asarray(risk_free_rate, dtype=float), years.shape)[:, None]
+    if not isinstance(hazard_rate, TermStructure):
+        hazard_rate = np.broadcast_to(np.asarray(hazard_rate, dtype=float), years.shape)[:, None]
+
+    t, mask, dt, periods = build_time_grid(years, frequency)
+    survival_prob = survival_probability(hazard_rate, t)
+    survival_prev = survival_probability(hazard_rate, t - dt[:, None])
+    discount = discount_factor(risk_free_rate, t)
+    final_survival = survival_probability(hazard_rate, (periods * dt)[:, None])[:, 0]
+    final_discount = discount_factor(risk_free_rate, years[:, None])[:, 0]
+
+    coupon = face_value * coupon_rate / frequency
+    return assemble_legs(*survival_legs(face_value, coupon, recovery_rate, survival_prob, survival_prev, discount, mask,
+                                        final_survival, final_discount), legs)
+
+
+def survival_legs(face_value, coupon, recovery_rate, survival_prob, survival_prev, discount, mask,
+                  final_survival, final_discount):
+    """
+    Survival-based NPV legs from precomputed (N x periods) survival and discount grids.
+
+    This is the pricing kernel shared by the batch pricer, the hazard bootstrapper and the Greeks:
+    the legs are linear in the survival grids, so passing their derivatives returns the
+    derivative of each leg.
+
+    Returns:
+        tuple: (coupon_leg, recovery_leg, principal_leg) arrays of length N.
+    """
+    coupon_leg = np.where(mask, coupon[:, None] * survival_prob * discount, 0.0).sum(axis=1)
+    recovery_leg = np.where(mask, (recovery_rate * face_value)[:, None] * (survival_prev - survival_prob) * discount,
+                            0.0).sum(axis=1)
+    principal_leg = face_value * final_survival * final_discount
+    return coupon_leg, recovery_leg, principal_leg
+
+
+def assemble_legs(coupon_leg, recovery_leg, principal_leg, legs):
+    """Sum the legs into the NPV; with legs=True return (npv, DataFrame of the legs and NPV) instead."""
+    npv = coupon_leg + recovery_leg + principal_leg
+    if legs:
+        return npv, pd.DataFrame({
+            'Coupon Leg': coupon_leg,
+            'Recovery Leg': recovery_leg,
+            'Principal Leg': principal_leg,
+            'NPV': npv
+        })
+    return npv
+
+
+# --- Schedule Pricing ---
+
+def survival_pricing_schedule(schedule, risk_free_rate, hazard_rate, recovery_rate, legs=False):
+    """
+    Survival-based NPV of a CashflowSchedule book (sinkers, step-ups, amortizers, pre-refunds, ...).
+
+    Coupons and principal are weighted by survival to their payment date; recovery is paid on the
+    notional outstanding during the period in which default occurs. A bullet schedule reproduces
+    survival_based_pricing_batch. Embedded call and put dates are not exercised here.
+
+    Args:
+        schedule (CashflowSchedule): Padded schedules for N bonds.
+        risk_free_rate (array-like or DiscountCurve): Rate per bond or shared curve.
+        hazard_rate (array-like or HazardCurve): Hazard per bond or shared curve.
+        recovery_rate (array-like): Recovery per bond.
+        legs (bool): If True, also return the leg breakdown as a DataFrame.
+    """
+    n_bonds = len(schedule)
+    if not isinstance(risk_free_rate, TermStructure):
+        risk_free_rate = np.broadcast_to(np.asarray(risk_free_rate, dtype=float), (n_bonds,))[:, None]
+    if not isinstance(hazard_rate, TermStructure):
+        hazard_rate = np.broadcast_to(np.asarray(hazard_rate, dtype=float), (n_bonds,))[:, None]
+    recovery_rate = np.broadcast_to(np.asarray(recovery_rate, dtype=float), (n_bonds,))
+
+    t = schedule.times
+    survival_prob = survival_probability(hazard_rate, t)
+    survival_prev = survival_probability(hazard_rate, t - 1 / schedule.frequency[:, None])
+    survival_discount = np.where(schedule.mask, survival_prob * discount_factor(risk_free_rate, t), 0.0)
+    default_discount = np.where(schedule.mask, (survival_prev - survival_prob) * discount_factor(risk_free_rate, t),
+                                0.0)
+
+    coupon_leg = (schedule.coupon * survival_discount).sum(axis=1)
+    recovery_leg = recovery_rate * (schedule.outstanding * default_discount).sum(axis=1)
+    principal_leg = (schedule.principal * survival_discount).sum(axis=1)
+    return assemble_legs(coupon_leg, recovery_leg, principal_leg, legs)
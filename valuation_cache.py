@@ -0,0 +1,357 @@
+import hashlib
+import inspect
+import io
+import json
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+from BondPricing_RiskBond_RecoverySensitivity import survival_based_pricing
+from curves import TermStructure
+from discounting import valuation_zero_coupon_bond
+from oas_engine import oas_model_batch
+from survival_batch import survival_based_pricing_batch
+
+CACHE_VERSION = 2  # bump when the key or stored-value format changes
+
+
+# --- Canonical Keys ---
+
+def _feed(digest, value):
+    """Feed a value into the digest in a canonical form: equal numbers hash equally whatever their type."""
+    if value is None:
+        digest.update(b'N')
+    elif isinstance(value, (bool, np.bool_)):
+        digest.update(b'B1' if value else b'B0')
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        # -0.0 and 0.0, 5 and 5.0 price the same bond
+        digest.update(b'F' + struct.pack('<d', float(value) + 0.0))
+    elif isinstance(value, str):
+        digest.update(b'S' + value.encode() + b'\0')
+    elif isinstance(value, TermStructure):
+        digest.update(b'T' + type(value).__name__.encode() + value.interpolation.encode())
+        _feed(digest, value.times)
+        _feed(digest, value.rates)
+    elif isinstance(value, (np.ndarray, pd.Series, list, tuple)):
+        array = np.asarray(value)
+        if array.dtype == object:
+            digest.update(b'L' + str(len(array)).encode())
+            for item in array.ravel():
+                _feed(digest, item)
+        else:
+            array = np.ascontiguousarray(array.astype(float) + 0.0 if array.dtype.kind in 'biuf' else array)
+            digest.update(b'A' + array.dtype.str.encode() + str(array.shape).encode())
+            digest.update(array.tobytes())
+    elif isinstance(value, dict):
+        digest.update(b'D')
+        for name in sorted(value):
+            _feed(digest, name)
+            _feed(digest, value[name])
+    else:
+        raise TypeError(f"Cannot build a canonical key from {type(value).__name__}.")
+
+
+def canonical_key(namespace, **inputs):
+    """
+    Stable hex digest of a pricer name plus its instrument terms and market inputs.
+
+    Inputs are hashed by name in sorted order, numbers as float64 (so 100, 100.0 and np.float64(100)
+    match), arrays by dtype, shape and bytes, and curves by their pillars and rates. The digest does not
+    depend on the process, so keys can be shared through the on-disk store. CACHE_VERSION is part of
+    every key, so a format change never reads entries written by an older one.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    _feed(digest, CACHE_VERSION)
+    _feed(digest, namespace)
+    _feed(digest, inputs)
+    return digest.hexdigest()
+
+
+# --- Serialization ---
+# Values go to the shared store as an .npz of plain arrays plus a JSON layout, and are read back with
+# allow_pickle=False: a row written by anyone with access to the file can corrupt a value, not run code.
+
+def _pack(value, arrays):
+    if isinstance(value, tuple):
+        return {'tuple': [_pack(item, arrays) for item in value]}
+    if isinstance(value, pd.DataFrame):
+        columns = [_pack(np.asarray(value[c]), arrays) for c in value.columns]
+        return {'frame': [str(c) for c in value.columns], 'columns': columns,
+                'index': _pack(np.asarray(value.index), arrays)}
+    if isinstance(value, (bool, int, float, np.number, np.bool_)):
+        return {'scalar': _pack(np.asarray(value), arrays)['array']}
+    array = np.asarray(value)
+    if array.dtype.hasobject:
+        raise TypeError(f"Cannot store {type(value).__name__} values without pickling.")
+    arrays[f'a{len(arrays)}'] = array
+    return {'array': f'a{len(arrays) - 1}'}
+
+
+def _unpack(layout, arrays):
+    if 'tuple' in layout:
+        return tuple(_unpack(item, arrays) for item in layout['tuple'])
+    if 'frame' in layout:
+        return pd.DataFrame({name: _unpack(column, arrays) for name, column in zip(layout['frame'], layout['columns'])},
+                            index=_unpack(layout['index'], arrays))
+    if 'scalar' in layout:
+        return arrays[layout['scalar']][()].item()
+    return arrays[layout['array']]
+
+
+def encode_value(value):
+    """Serialize a valuation (scalar, array, DataFrame or tuple of these) to bytes without pickle."""
+    arrays = {}
+    layout = _pack(value, arrays)
+    buffer = io.BytesIO()
+    np.savez(buffer, layout=np.array(json.dumps(layout)), **arrays)
+    return buffer.getvalue()
+
+
+def decode_value(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as stored:
+        arrays = {name: stored[name] for name in stored.files}
+    return _unpack(json.loads(str(arrays.pop('layout'))), arrays)
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Make every array in a cached value read-only, including those inside tuples."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _share(value):
+    """What a lookup hands out: frozen arrays as they are, DataFrames (which cannot be frozen) as copies."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    return value
+
+
+# --- Cache ---
+
+class ValuationCache:
+    """
+    Bounded LRU cache of valuations, optionally backed by an SQLite file shared across processes.
+
+    The in-memory tier is an OrderedDict evicted least-recently-used first once it holds more than
+    max_entries values or max_bytes of them. With a path, every stored valuation is also written to
+    SQLite (WAL mode, so several risk processes can read and write the same file), and memory misses
+    fall through to it. Stored values are plain arrays (see encode_value), never pickles. Cached arrays,
+    including those inside tuples, are returned read-only and DataFrames as copies, so no caller can
+    corrupt the value later hits return.
+    """
+
+    def __init__(self, max_entries=100_000, max_bytes=256 * 2 ** 20, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = self.bypassed = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS valuations (key TEXT PRIMARY KEY, value BLOB)")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _remember(self, key, value):
+        _freeze(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= _nbytes(old)
+        self._entries[key] = value
+        self._bytes += _nbytes(value)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _nbytes(evicted)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _share(value)
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM valuations WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                try:
+                    value = decode_value(row[0])
+                except (ValueError, KeyError, TypeError, OSError):
+                    value = None  # unreadable row: treat as a miss and let put() overwrite it
+                if value is not None:
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return _share(value)
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self._db is not None:
+            try:
+                blob = encode_value(value)
+            except TypeError:
+                return _share(value)  # not representable without pickle: kept in memory only
+            self._db.execute("INSERT OR REPLACE INTO valuations (key, value) VALUES (?, ?)", (key, blob))
+        return _share(value)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self, disk=False):
+        self._entries.clear()
+        self._bytes = 0
+        if disk and self._db is not None:
+            self._db.execute("DELETE FROM valuations")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'Hits': self.hits,
+            'Disk Hits': self.disk_hits,
+            'Misses': self.misses,
+            'Bypassed': self.bypassed,
+            'Evictions': self.evictions,
+            'Entries': len(self._entries),
+            'Memory (MB)': self._bytes / 2 ** 20,
+            'Hit Rate': (self.hits + self.disk_hits) / lookups if lookups else np.nan,
+        }
+
+    def wrap(self, pricer, namespace=None, require=(), version=1):
+        """
+        Cached version of a pricer: calls are keyed on every bound argument (defaults included) and on
+        the pricer's version, which should be bumped whenever the pricer's results change.
+
+        Calls whose `require` arguments are None (e.g. an OAS pricer without a seed) or whose inputs
+        cannot be hashed canonically (e.g. a live np.random.Generator) are priced directly and counted
+        as bypassed, since their result is not reproducible.
+        """
+        namespace = f"{namespace or f'{pricer.__module__}.{pricer.__qualname__}'}@v{version}"
+        signature = inspect.signature(pricer)
+
+        @wraps(pricer)
+        def cached_pricer(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                if any(bound.arguments.get(name) is None for name in require):
+                    raise TypeError("Unseeded call.")
+                key = canonical_key(namespace, **bound.arguments)
+            except TypeError:
+                self.bypassed += 1
+                return pricer(*args, **kwargs)
+            return self.get_or_compute(key, lambda: pricer(*args, **kwargs))
+
+        cached_pricer.cache = self
+        return cached_pricer
+
+
+# --- Cached Pricers ---
+# One process-wide cache in front of the survival, zero-coupon and OAS pricers.
+
+valuation_cache = ValuationCache(path=os.environ.get("BONDPRICER_VALUATION_CACHE"))
+cached_survival_pricing = valuation_cache.wrap(survival_based_pricing, 'survival_based_pricing')
+cached_survival_pricing_batch = valuation_cache.wrap(survival_based_pricing_batch, 'survival_based_pricing_batch')
+cached_zero_coupon_bond = valuation_cache.wrap(valuation_zero_coupon_bond, 'valuation_zero_coupon_bond')
+cached_oas_model_batch = valuation_cache.wrap(oas_model_batch, 'oas_model_batch', require=('rng',))
+
+
+# --- Main Execution ---
+
+def risk_run(pricers):
+    """The recovery / hazard / OAS sweeps and V1..V4 valuations that desks rerun during the day."""
+    survival, zero_coupon, oas = pricers
+    recovery_sweep = [survival(100, 0.05, 5, 0.03, 0.15, r) for r in np.linspace(0.1, 0.9, 9)]
+    hazard_sweep = [survival(100, 0.05, 5, 0.03, h, 0.4) for h in np.linspace(0.01, 0.30, 30)]
+    valuations = [zero_coupon(100, rate, ttm, 'annual') for rate, ttm in
+                  [(0.04, 360 / 360), (0.04, 359 / 360), (0.06, 359 / 360), (0.06, 359 / 360)]]
+    oas_curve = oas(100, 0.05, 5, np.linspace(0.0, 0.1, 20), 100, 3, rng=42, antithetic=True)
+    return np.concatenate([recovery_sweep, hazard_sweep, valuations, oas_curve])
+
+
+def main():
+    direct = (survival_based_pricing, valuation_zero_coupon_bond, oas_model_batch)
+    cached = (cached_survival_pricing, cached_zero_coupon_bond, cached_oas_model_batch)
+    n_desks = 20
+
+    start = time.perf_counter()
+    reference = [risk_run(direct) for _ in range(n_desks)]
+    direct_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [risk_run(cached) for _ in range(n_desks)]
+    cached_time = time.perf_counter() - start
+
+    print(f"\n📊 {n_desks} Desk Risk Runs: direct {direct_time:.3f}s vs cached {cached_time:.3f}s\n")
+    print(f"Identical results: {all(np.array_equal(a, b) for a, b in zip(reference, results))}")
+    print(pd.DataFrame([valuation_cache.stats]).round(4).to_string(index=False))
+
+    # A second process (here: a second cache object) warming up from the shared SQLite store
+    names = ('survival_based_pricing', 'valuation_zero_coupon_bond', 'oas_model_batch')
+    with tempfile.TemporaryDirectory(prefix='valuations_') as root:
+        path = os.path.join(root, 'valuations.sqlite')
+        writer = ValuationCache(path=path)
+        risk_run(tuple(writer.wrap(p, n) for p, n in zip(direct, names)))
+        reader = ValuationCache(path=path)
+        shared = risk_run(tuple(reader.wrap(p, n) for p, n in zip(direct, names)))
+        legs = writer.wrap(survival_based_pricing_batch, 'survival_based_pricing_batch')
+        fresh = legs(100, 0.05, [3, 5], 0.03, 0.02, 0.4, legs=True)
+        stored = reader.wrap(survival_based_pricing_batch, 'survival_based_pricing_batch')(
+            100, 0.05, [3, 5], 0.03, 0.02, 0.4, legs=True)
+        print("\n📊 Shared On-Disk Store (second process starts warm)\n")
+        print(pd.DataFrame([writer.stats, reader.stats], index=['Writer', 'Reader']).round(4).to_string())
+        print(f"\nRead back without pickle: values identical {np.array_equal(shared, reference[0])}, "
+              f"legs frame identical {fresh[1].equals(stored[1])}")
+        writer.close()
+        reader.close()
+
+    # Bounded memory: a small cache under a long hazard sweep
+    small = ValuationCache(max_entries=50)
+    sweep = small.wrap(survival_based_pricing, 'survival_based_pricing')
+    for _ in range(2):
+        for h in np.linspace(0.0, 0.5, 100):
+            sweep(100, 0.05, 5, 0.03, h, 0.4)
+    print("\n📊 LRU Eviction (50 entries, 100-point sweep run twice)\n")
+    print(pd.DataFrame([small.stats]).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()